@@ -20,8 +20,25 @@ Key Concepts to Practice:
 Note: Focus on understanding why we use each concept, not just how!
 """
 
+import gc
+import hashlib
+import heapq
+import itertools
+import multiprocessing
+import os
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterator, Optional
+
+from practice_helpers import (AuthorPostIndex, CatalogStatistics, CourseCatalog, EngagementReplica,
+                              HashtagAutocomplete, HotPostLeaderboard, IndexedWaitlist, ModerationFilter,
+                              NearDuplicateDetector, PostArchive, PostSearchIndex, PrerequisiteGraph,
+                              RenderCache, ScheduleIndex, TimePartitionedStore, TokenBucketLimiter,
+                              VisibilityIndex, find_schedule_conflicts, rescan_posts, week_minute)
 
 # =============================================================================
 # Problem 1: Library Management System
@@ -442,9 +459,11 @@ Requirements:
    - post_id (int): Unique auto-generated ID
    - author (string): Post author's username
    - content (string): Post content/text
-   - timestamp (string): When post was created
-   - likes_count (int): Number of likes (starts at 0)
-   - comments (list): list to store comment strings
+   - timestamp (string): When post was created (formatted from created_at)
+   - created_at (int): Creation time as epoch seconds
+   - likes_count (int): Number of likes (starts at 0, read from engagement)
+   - comments (list): list to store comment strings (read from engagement)
+   - engagement (EngagementReplica): This node's replicated likes/comments
    - is_public (bool): Whether post is public or private
    - hashtags (list): list of hashtags extracted from content
 
@@ -479,11 +498,30 @@ Expected Features:
 - Content editing with hashtag refresh
 """
 
+# The indexes and caches Problem 3 builds on live in practice_helpers.py.
+
+
 class SocialMediaPost:
    # Define class variables
    platform_name = "PythonSocial"
    total_posts = 0
    post_id_counter = 10000
+   node_id = "node-1"                   # identifies this process's replicas
+   posts_by_id = {}                     # post_id -> SocialMediaPost
+   search_index = PostSearchIndex()     # full-text index over content
+   render_cache = RenderCache()         # summary/__str__/__repr__ renders
+   duplicate_detector = NearDuplicateDetector()
+   post_rate_limiter = TokenBucketLimiter(rate=1.0, capacity=10)        # posts per author
+   engagement_rate_limiter = TokenBucketLimiter(rate=5.0, capacity=50)  # likes/comments per user
+   anonymous_like_limiter = TokenBucketLimiter(rate=5.0, capacity=50)   # likes per post with no liker
+   timeline = TimePartitionedStore()    # post IDs partitioned by creation hour
+   hot_posts = HotPostLeaderboard()     # time-decayed engagement ranking
+   visibility = VisibilityIndex()       # public bitmap + per-author bitmaps
+   hashtag_index = HashtagAutocomplete()  # prefix -> most used hashtags
+   archive = PostArchive()              # compressed on-disk cold tier
+   moderation = ModerationFilter()      # banned phrases (empty by default)
+   author_index = AuthorPostIndex()     # per-author posts in creation order
+   _ARCHIVED_FIELDS = ("content", "hashtags", "engagement")
    
    def __init__(self, author: str, content: str, is_public: bool = True):
        """
@@ -504,29 +542,181 @@ class SocialMediaPost:
             raise ValueError("Author must be a non-empty string without spaces.")
        if not content or len(content) > 280:
             raise ValueError("Content must be a non-empty string with max 280 characters.")
+       SocialMediaPost._check_moderation(content)
+       if not SocialMediaPost.post_rate_limiter.allow(author):
+           raise ValueError(f"Rate limit exceeded: {author} is posting too fast.")
        self.author = author
        self.content = content
        self.post_id = SocialMediaPost.post_id_counter
-       self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-       self.likes_count = 0
-       self.comments = []
+       self.created_at = int(time.time())
+       self.last_active_at = self.created_at
+       self._archive_block = None       # block holding the archived fields
+       self.engagement = EngagementReplica(SocialMediaPost.node_id)
        self.is_public = is_public
        self.hashtags = self._extract_hashtags(content)
+       for tag in self.hashtags:
+           SocialMediaPost.hashtag_index.record(tag)
+       self._version = 0                # bumped on every mutation
+       self._deleted = False
+       self._peak_likes = 0             # most net likes hot_posts has been told about
+       SocialMediaPost.posts_by_id[self.post_id] = self
+       SocialMediaPost.search_index.add_post(self.post_id, content)
+       SocialMediaPost.timeline.add(self.post_id, self.created_at)
+       SocialMediaPost.visibility.add(self.post_id, author, is_public)
+       SocialMediaPost.author_index.add(self.post_id, author, self.created_at, is_public)
+       if not is_public:
+           SocialMediaPost.hot_posts.hide(self.post_id)
+       SocialMediaPost.hot_posts.record(self.post_id, HotPostLeaderboard.POST, self.created_at)
+       self.duplicate_of = SocialMediaPost.duplicate_detector.add(self.post_id, content)
        SocialMediaPost.post_id_counter += 1
        SocialMediaPost.total_posts += 1
    
-   def add_like(self) -> str:
+   def __getattr__(self, name: str):
+       """Rehydrate archived fields on first access (only called for missing attributes)."""
+       if name in SocialMediaPost._ARCHIVED_FIELDS and self.__dict__.get("_archive_block") is not None:
+           self._rehydrate()
+           return getattr(self, name)
+       raise AttributeError(f"'SocialMediaPost' object has no attribute '{name}'")
+   
+   def _rehydrate(self) -> None:
+       """Load this post's archived fields back into memory."""
+       state = SocialMediaPost.archive.restore(self._archive_block, self.post_id)
+       self.__dict__.update(state)
+       self._archive_block = None
+       self.last_active_at = int(time.time())
+   
+   @property
+   def is_archived(self) -> bool:
+       return self._archive_block is not None
+   
+   def _check_not_deleted(self) -> None:
+       """Reject changes to a post that has been deleted."""
+       if self._deleted:
+           raise ValueError(f"Post {self.post_id} has been deleted.")
+   
+   @staticmethod
+   def reset_platform() -> None:
+       """
+       Forget every post and start the shared indexes afresh.
+       
+       Demos and benchmarks call this first so they don't see each other's
+       posts. Posts created before the reset count as deleted; post IDs keep
+       counting up, so they never repeat. Archived posts get their fields
+       back first, so they stay readable once the old archive is gone.
+       """
+       posts = SocialMediaPost.posts_by_id
+       for post_id, state in SocialMediaPost.archive.scan():
+           posts[post_id].__dict__.update(state)
+           posts[post_id]._archive_block = None
+       for post in posts.values():
+           post._deleted = True
+       SocialMediaPost.archive.close()
+       SocialMediaPost.total_posts = 0
+       SocialMediaPost.posts_by_id = {}
+       SocialMediaPost.search_index = PostSearchIndex()
+       SocialMediaPost.render_cache = RenderCache()
+       SocialMediaPost.duplicate_detector = NearDuplicateDetector()
+       SocialMediaPost.post_rate_limiter = TokenBucketLimiter(rate=1.0, capacity=10)
+       SocialMediaPost.engagement_rate_limiter = TokenBucketLimiter(rate=5.0, capacity=50)
+       SocialMediaPost.anonymous_like_limiter = TokenBucketLimiter(rate=5.0, capacity=50)
+       SocialMediaPost.timeline = TimePartitionedStore()
+       SocialMediaPost.hot_posts = HotPostLeaderboard()
+       SocialMediaPost.visibility = VisibilityIndex()
+       SocialMediaPost.hashtag_index = HashtagAutocomplete()
+       SocialMediaPost.archive = PostArchive()
+       SocialMediaPost.moderation = ModerationFilter()
+       SocialMediaPost.author_index = AuthorPostIndex()
+   
+   @staticmethod
+   def archive_cold_posts(max_age_hours: float = 24 * 30, idle_hours: float = 24 * 7,
+                          block_size: int = 1000) -> int:
+       """
+       Move old, inactive posts' content, hashtags and engagement to disk.
+       
+       Only partitions older than max_age_hours are scanned. Archived posts
+       rehydrate transparently the next time one of those fields is used.
+       Returns the number of posts archived.
+       """
+       now = int(time.time())
+       idle_cutoff = now - int(idle_hours * 3600)
+       old_ids = SocialMediaPost.timeline.query(0, now - int(max_age_hours * 3600) + 1)
+       cold = [post for post in map(SocialMediaPost.posts_by_id.get, old_ids)
+               if post is not None and not post.is_archived and post.last_active_at <= idle_cutoff]
+       for start in range(0, len(cold), block_size):
+           batch = cold[start:start + block_size]
+           block_id = SocialMediaPost.archive.archive(
+               {post.post_id: {field: post.__dict__[field] for field in SocialMediaPost._ARCHIVED_FIELDS}
+                for post in batch})
+           for post in batch:
+               for field in SocialMediaPost._ARCHIVED_FIELDS:
+                   del post.__dict__[field]
+               post._archive_block = block_id
+       return len(cold)
+   
+   @staticmethod
+   def _check_moderation(text: str) -> None:
+       """Reject text containing a banned phrase (one pass over the text)."""
+       if SocialMediaPost.moderation:
+           found = SocialMediaPost.moderation.find(text, first_only=True)
+           if found:
+               raise ValueError(f"Text contains a banned phrase: '{found[0]}'")
+   
+   @staticmethod
+   def update_banned_phrases(phrases: list[str], processes: int = 4) -> dict[int, list[str]]:
+       """
+       Install a new banned-phrase list and re-scan every existing post.
+       
+       Returns post_id -> banned phrases found in its content or comments.
+       Archived posts are scanned straight from their blocks and stay archived.
+       """
+       SocialMediaPost.moderation = ModerationFilter(phrases)
+       posts = [(post.post_id, [post.content, *post.comments])
+                for post in SocialMediaPost.posts_by_id.values() if not post.is_archived]
+       posts += [(post_id, [state["content"], *state["engagement"].ordered_comments()])
+                 for post_id, state in SocialMediaPost.archive.scan()]
+       return rescan_posts(posts, phrases, processes)
+   
+   @property
+   def timestamp(self) -> str:
+       """Creation time formatted for display (computed only when asked for)."""
+       return datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d %H:%M:%S")
+   
+   @property
+   def likes_count(self) -> int:
+       """Number of likes, merged across all replicas seen so far."""
+       return self.engagement.likes_count
+   
+   @property
+   def comments(self) -> list[str]:
+       """Comments as "username: comment text", oldest first."""
+       return self.engagement.ordered_comments()
+   
+   def add_like(self, liker: Optional[str] = None,
+                idempotency_key: Optional[str] = None) -> str:
        """
        Add a like to the post.
        
        TODO: Implement this method
        - Increment likes_count
        - Return success message with new count
+       
+       When liker is given, the like counts against their rate limit;
+       anonymous likes share a per-post bucket instead.
+       A retried call with the same idempotency_key is counted once.
        """
-       self.likes_count += 1
+       self._check_not_deleted()
+       if liker is None:
+           if not SocialMediaPost.anonymous_like_limiter.allow(self.post_id):
+               raise ValueError(f"Rate limit exceeded: post {self.post_id} is getting anonymous likes too fast.")
+       elif not SocialMediaPost.engagement_rate_limiter.allow(liker):
+           raise ValueError(f"Rate limit exceeded: {liker} is liking too fast.")
+       if self.engagement.like(idempotency_key):
+           self._version += 1
+           self.last_active_at = int(time.time())
+           self._record_like_gains()
        return f"Post {self.post_id} by {self.author} now has {self.likes_count} likes."
    
-   def remove_like(self) -> str:
+   def remove_like(self, idempotency_key: Optional[str] = None) -> str:
        """
        Remove a like from the post.
        
@@ -534,10 +724,14 @@ class SocialMediaPost:
        - Decrement likes_count (minimum 0)
        - Return message with new count
        """
-       self.likes_count = max(0, self.likes_count - 1)
+       self._check_not_deleted()
+       if self.engagement.unlike(idempotency_key):
+           self._version += 1
+           self.last_active_at = int(time.time())
        return f"Post {self.post_id} by {self.author} now has {self.likes_count} likes."
    
-   def add_comment(self, commenter: str, comment_text: str) -> str:
+   def add_comment(self, commenter: str, comment_text: str,
+                   idempotency_key: Optional[str] = None) -> str:
        """
        Add a comment to the post.
        
@@ -547,9 +741,45 @@ class SocialMediaPost:
        - Add to comments list in format "username: comment text"
        - Return success message
        """
-       self.comments.append(f"{commenter}: {comment_text}")
+       self._check_not_deleted()
+       if not isinstance(commenter, str) or not commenter.strip():
+           raise ValueError("Commenter must be a non-empty string.")
+       if not isinstance(comment_text, str) or not comment_text.strip() or len(comment_text) > 100:
+           raise ValueError("Comment must be a non-empty string with max 100 characters.")
+       SocialMediaPost._check_moderation(comment_text)
+       if not SocialMediaPost.engagement_rate_limiter.allow(commenter):
+           raise ValueError(f"Rate limit exceeded: {commenter} is commenting too fast.")
+       if self.engagement.add_comment(f"{commenter}: {comment_text}", idempotency_key):
+           self._version += 1
+           self.last_active_at = int(time.time())
+           SocialMediaPost.hot_posts.record(self.post_id, HotPostLeaderboard.COMMENT)
        return f"Comment added by {commenter} on post {self.post_id}: '{comment_text}'"
    
+   def merge_engagement(self, replica: EngagementReplica) -> str:
+       """Merge likes/comments recorded for this post by another node."""
+       self._check_not_deleted()
+       comments = len(self.engagement.comments)
+       self.engagement.merge(replica)
+       self._version += 1
+       self._record_like_gains()
+       for _ in range(len(self.engagement.comments) - comments):
+           SocialMediaPost.hot_posts.record(self.post_id, HotPostLeaderboard.COMMENT)
+       return f"Post {self.post_id} merged engagement from {replica.node_id}: {self.likes_count} likes."
+   
+   def _record_like_gains(self) -> None:
+       """
+       Rank only likes above the post's previous peak.
+       
+       Leaderboard scores never go down, so an unlike can't be taken back
+       out; counting only net gains stops like/unlike cycles from
+       inflating a post's hotness.
+       """
+       gained = self.engagement.net_likes - self._peak_likes
+       if gained > 0:
+           self._peak_likes += gained
+           for _ in range(gained):
+               SocialMediaPost.hot_posts.record(self.post_id, HotPostLeaderboard.LIKE)
+   
    def edit_content(self, new_content: str) -> str:
        """
        Edit the post content.
@@ -560,10 +790,21 @@ class SocialMediaPost:
        - Re-extract hashtags
        - Return success message
        """
+       self._check_not_deleted()
        if not new_content or len(new_content) > 280:
            raise ValueError("New content must be a non-empty string with max 280 characters.")
+       SocialMediaPost._check_moderation(new_content)
+       SocialMediaPost.search_index.update_post(self.post_id, self.content, new_content)
        self.content = new_content
+       old_hashtags = set(self.hashtags)
        self.hashtags = self._extract_hashtags(new_content)
+       for tag in self.hashtags:
+           if tag not in old_hashtags:
+               SocialMediaPost.hashtag_index.record(tag)
+       for tag in old_hashtags.difference(self.hashtags):
+           SocialMediaPost.hashtag_index.forget(tag)
+       self._version += 1
+       self.last_active_at = int(time.time())
        return f"Post {self.post_id} content updated successfully."
    
    def _extract_hashtags(self, text: str) -> list[str]:
@@ -587,14 +828,43 @@ class SocialMediaPost:
    
    def make_private(self) -> str:
        """Make the post private."""
+       self._check_not_deleted()
        self.is_public = False
+       self._version += 1
+       SocialMediaPost.hot_posts.hide(self.post_id)
+       SocialMediaPost.visibility.set_public(self.post_id, False)
+       SocialMediaPost.author_index.set_public(self.post_id, self.author, False)
        return f"Post {self.post_id} by {self.author} is now private."
    
    def make_public(self) -> str:
        """Make the post public."""
+       self._check_not_deleted()
        self.is_public = True
+       self._version += 1
+       SocialMediaPost.hot_posts.show(self.post_id)
+       SocialMediaPost.visibility.set_public(self.post_id, True)
+       SocialMediaPost.author_index.set_public(self.post_id, self.author, True)
        return f"Post {self.post_id} by {self.author} is now public."
    
+   def delete(self) -> str:
+       """Delete the post and remove it from every index."""
+       if self._deleted:
+           return f"Post {self.post_id} was already deleted."
+       self._deleted = True
+       SocialMediaPost.posts_by_id.pop(self.post_id, None)
+       SocialMediaPost.search_index.remove_post(self.post_id, self.content)
+       SocialMediaPost.timeline.remove(self.post_id, self.created_at)
+       SocialMediaPost.visibility.remove(self.post_id, self.author)
+       SocialMediaPost.author_index.remove(self.post_id, self.author)
+       SocialMediaPost.hot_posts.forget(self.post_id)
+       SocialMediaPost.duplicate_detector.remove(self.post_id)
+       for tag in self.hashtags:
+           SocialMediaPost.hashtag_index.forget(tag)
+       for kind in ("summary", "str", "repr"):
+           SocialMediaPost.render_cache.discard((self.post_id, self._version, kind))
+       SocialMediaPost.total_posts -= 1
+       return f"Post {self.post_id} by {self.author} has been deleted."
+   
    def get_post_summary(self) -> str:
        """
        Get comprehensive post information.
@@ -605,6 +875,15 @@ class SocialMediaPost:
        - Show recent comments (last 3)
        - Display hashtags
        """
+       return self._cached_render("summary", self._render_summary)
+   
+   def _cached_render(self, kind: str, render: Callable[[], str]) -> str:
+       """Serve a rendering of this post from the shared render cache."""
+       key = (self.post_id, self._version, kind)
+       return SocialMediaPost.render_cache.get_or_render(key, render)
+   
+   def _render_summary(self) -> str:
+       """Build the multi-line summary returned by get_post_summary()."""
        recent_comments = self.comments[-3:] if len(self.comments) > 3 else self.comments
        comments_str = "\n".join(recent_comments) if recent_comments else "No comments yet."
        hashtags_str = ", ".join(self.hashtags) if self.hashtags else "No hashtags."
@@ -612,23 +891,74 @@ class SocialMediaPost:
                 f"Content: {self.content}\nLikes: {self.likes_count} | Public: {'Yes' if self.is_public else 'No'}\n"
                 f"Hashtags: {hashtags_str}\nComments:\n{comments_str}")
    
+   @staticmethod
+   def search(query: str, limit: int = 10) -> list["SocialMediaPost"]:
+       """Return public posts matching query, most relevant first (BM25)."""
+       posts = SocialMediaPost.posts_by_id
+       hits = SocialMediaPost.search_index.search(
+           query, limit, accept=lambda post_id: post_id in posts and posts[post_id].is_public)
+       return [posts[post_id] for post_id, _ in hits]
+   
+   @staticmethod
+   def get_hot_posts(limit: int = 100) -> list["SocialMediaPost"]:
+       """Return the hottest public posts (likes, comments and age combined)."""
+       posts = SocialMediaPost.posts_by_id
+       return [posts[post_id] for post_id in SocialMediaPost.hot_posts.top(limit) if post_id in posts]
+   
+   @staticmethod
+   def public_posts_by(author: str) -> list["SocialMediaPost"]:
+       """Return an author's public posts, oldest first."""
+       posts = SocialMediaPost.posts_by_id
+       return [posts[post_id] for post_id in SocialMediaPost.visibility.public_by_author(author)
+               if post_id in posts]
+   
+   @staticmethod
+   def get_author_posts(author: str, cursor: Optional[int] = None, limit: int = 20,
+                        include_private: bool = False) -> tuple[list["SocialMediaPost"], Optional[int]]:
+       """Return one page of an author's posts (newest first) and the next cursor."""
+       post_ids, next_cursor = SocialMediaPost.author_index.page(author, cursor, limit, include_private)
+       posts = SocialMediaPost.posts_by_id
+       return [posts[post_id] for post_id in post_ids if post_id in posts], next_cursor
+   
+   @staticmethod
+   def count_posts_by(author: str, include_private: bool = False) -> int:
+       """Number of posts by author (public only unless include_private)."""
+       return SocialMediaPost.author_index.count(author, include_private)
+   
+   @staticmethod
+   def suggest_hashtags(prefix: str, limit: int = 10) -> list[str]:
+       """Autocomplete a hashtag being typed (e.g. "#py"), most used first."""
+       return SocialMediaPost.hashtag_index.suggest(prefix, limit)
+   
+   @staticmethod
+   def recent_posts(hours: float = 6, include_private: bool = False) -> list["SocialMediaPost"]:
+       """Return posts created in the last `hours` hours, oldest first."""
+       now = int(time.time())
+       post_ids = SocialMediaPost.timeline.query(now - int(hours * 3600), now + 1)
+       public = SocialMediaPost.visibility.public
+       return [SocialMediaPost.posts_by_id[post_id] for post_id in post_ids
+               if post_id in SocialMediaPost.posts_by_id and (include_private or post_id in public)]
+   
    def __str__(self) -> str:
        """Human-readable representation."""
-       return (f"Post ID: {self.post_id} | Author: {self.author} | Content: {self.content[:50]}... "
-                f"| Likes: {self.likes_count} | Public: {'Yes' if self.is_public else 'No'}")
+       return self._cached_render("str", lambda: (
+                f"Post ID: {self.post_id} | Author: {self.author} | Content: {self.content[:50]}... "
+                f"| Likes: {self.likes_count} | Public: {'Yes' if self.is_public else 'No'}"))
    
    def __repr__(self) -> str:
        """Developer representation."""
-       return (f"SocialMediaPost(post_id={self.post_id}, author='{self.author}', "
+       return self._cached_render("repr", lambda: (
+                f"SocialMediaPost(post_id={self.post_id}, author='{self.author}', "
                 f"content='{self.content[:50]}...', timestamp='{self.timestamp}', "
                 f"likes_count={self.likes_count}, is_public={self.is_public}, "
-                f"hashtags={self.hashtags}, comments={self.comments})")
+                f"hashtags={self.hashtags}, comments={self.comments})"))
 
 
 # Test cases for Problem 3
 def test_social_media_post():
    """Test the SocialMediaPost class implementation."""
    print("\n=== Testing Problem 3: SocialMediaPost Class ===")
+   SocialMediaPost.reset_platform()
    
    try:
        # Create posts
@@ -650,15 +980,225 @@ def test_social_media_post():
        # Test privacy
        print(post2.make_private())
        
+       # Test full-text search (private posts are never returned)
+       print("Search 'python':", [post.post_id for post in SocialMediaPost.search("python")])
+       print("Search 'design':", [post.post_id for post in SocialMediaPost.search("design")])
+       
        # Show summaries
        print(post1.get_post_summary())
+       print(post1.get_post_summary())  # Served from the render cache
+       print(post1.add_like())          # Invalidates the cached summary
+       print(post1.get_post_summary())
+       print(SocialMediaPost.render_cache.get_stats())
+       
+       # Test near-duplicate detection
+       spam1 = SocialMediaPost("promo_bot", "Win a free phone today click the link in bio now #free")
+       spam2 = SocialMediaPost("promo_bot2", "Win a free phone today click the link in bio now!! #free")
+       print(f"Post {spam2.post_id} duplicates post {spam2.duplicate_of}")
+       print("Duplicate clusters:", SocialMediaPost.duplicate_detector.cluster_sizes())
+       
+       # Test replicated engagement: a retried like counts once, and a
+       # second node's likes merge in without coordination
+       print(post1.add_like(idempotency_key="like-42"))
+       print(post1.add_like(idempotency_key="like-42"))  # Retry is ignored
+       print(post1.add_comment("erin", "Nice one!", idempotency_key="comment-7"))
+       other_node = EngagementReplica("node-2")
+       other_node.like()
+       other_node.like("like-42")                       # Same retry, landing on node-2
+       other_node.add_comment("erin: Nice one!", "comment-7")
+       print(post1.merge_engagement(other_node))
+       
+       # Test the hot posts leaderboard
+       print("Hot posts:", [post.post_id for post in SocialMediaPost.get_hot_posts(3)])
+       
+       # Test bitmap-backed visibility listings
+       print("Public posts by bob_designer:", [post.post_id for post in SocialMediaPost.public_posts_by("bob_designer")])
+       print("Public posts by alice_dev:", [post.post_id for post in SocialMediaPost.public_posts_by("alice_dev")])
+       
+       # Test per-author pagination and counts
+       draft = SocialMediaPost("alice_dev", "Second post from alice")
+       page, cursor = SocialMediaPost.get_author_posts("alice_dev", limit=1)
+       print("alice_dev page 1:", [post.post_id for post in page], "| next cursor:", cursor)
+       page, cursor = SocialMediaPost.get_author_posts("alice_dev", cursor=cursor, limit=1)
+       print("alice_dev page 2:", [post.post_id for post in page], "| next cursor:", cursor)
+       print(draft.delete())
+       try:
+           draft.add_like()
+       except ValueError as e:
+           print(f"Error: {e}")
+       print(f"alice_dev has {SocialMediaPost.count_posts_by('alice_dev')} public posts")
+       
+       # Test hashtag autocomplete
+       print("Suggestions for '#py':", SocialMediaPost.suggest_hashtags("#py"))
+       print("Suggestions for '#d':", SocialMediaPost.suggest_hashtags("#d"))
+       
+       # Test time-range queries over the hourly partitions
+       print("Posts from the last 6 hours:", [post.post_id for post in SocialMediaPost.recent_posts(6)])
+       
+       # Test the archival tier: archived posts rehydrate on access
+       print(f"Archived {SocialMediaPost.archive_cold_posts(max_age_hours=0, idle_hours=0)} posts")
+       print(f"Post {post1.post_id} archived: {post1.is_archived}")
+       print(post1.add_comment("frank", "Found this in the archive!"))
+       print(f"Post {post1.post_id} archived: {post1.is_archived} | Comments: {len(post1.comments)}")
+       
+       # Test moderation: new text is checked inline, old posts in batch
+       print("Flagged posts:", SocialMediaPost.update_banned_phrases(["free phone", "click the link"]))
+       try:
+           post1.add_comment("spammer", "Get a FREE PHONE now")
+       except ValueError as e:
+           print(f"Error: {e}")
+       SocialMediaPost.moderation = ModerationFilter()
+       
+       # Test per-user rate limiting (burst of 50, then throttled)
+       try:
+           for _ in range(60):
+               post2.add_like("like_bot")
+       except ValueError as e:
+           print(f"Error: {e}")
        print(f"Total posts on {SocialMediaPost.platform_name}: {SocialMediaPost.total_posts}")
        
    except Exception as e:
        print(f"Error testing SocialMediaPost class: {e}")
 
-# Uncomment to test Problem 3
-test_social_media_post()
+# Problem 3's test runs from the main block at the end of the file: its
+# moderation rescan and the CRDT simulation start worker processes, and under
+# the spawn start method (macOS, Windows) each worker re-imports this file.
+
+
+def _engagement_worker(node: int, nodes: int, operations: int, seed: int) -> tuple:
+    """
+    Apply this node's share of a shared operation log on one replica.
+
+    Operation i always has key f"op-{i}" and the same kind and text, like a
+    client request. 10% of the time the node instead retries a random
+    operation from the whole log, usually one owned by another node, the
+    way a client retry lands on whichever node answers. Returns the replica,
+    the time taken and the keys of the likes, unlikes and comments applied.
+    """
+    total = nodes * operations
+    log_rng = random.Random(seed)
+    kinds = [log_rng.random() for _ in range(total)]
+    rng = random.Random(seed + 1 + node)
+    replica = EngagementReplica(f"node-{node}")
+    applied = {"like": set(), "unlike": set(), "comment": set()}
+    start = time.perf_counter()
+    for i in range(node * operations, (node + 1) * operations):
+        if rng.random() < 0.1:
+            i = rng.randrange(total)              # client retry, possibly of another node's op
+        key = f"op-{i}"
+        if kinds[i] < 0.7:
+            if replica.like(key):
+                applied["like"].add(key)
+        elif kinds[i] < 0.85:
+            if replica.unlike(key):
+                applied["unlike"].add(key)
+        elif replica.add_comment(f"user{i % 1000}: comment {i}", key):
+            applied["comment"].add(key)
+    return replica, time.perf_counter() - start, applied
+
+
+def simulate_engagement_replication(nodes: int = 4, operations_per_node: int = 50_000):
+    """
+    Run one replica per process, then gossip until all replicas agree.
+
+    Reports local write throughput, the number of gossip rounds and the time
+    needed to converge, and checks that operations retried on several nodes
+    were counted once.
+    """
+    print(f"\n=== Engagement CRDT simulation: {nodes} processes x {operations_per_node} ops ===")
+    jobs = [(n, nodes, operations_per_node, 7) for n in range(nodes)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(nodes) as pool:
+        results = pool.starmap(_engagement_worker, jobs)
+    wall_time = time.perf_counter() - start
+    replicas = [replica for replica, _, _ in results]
+    busiest = max(elapsed for _, elapsed, _ in results)
+    print(f"Write throughput: {nodes * operations_per_node / busiest:,.0f} ops/sec "
+          f"({wall_time:.2f}s wall time including process start-up)")
+    
+    # Gossip: each round every replica merges a snapshot of one random peer
+    rng = random.Random(0)
+    rounds = 0
+    start = time.perf_counter()
+    while not all(replica.same_state(replicas[0]) for replica in replicas[1:]):
+        rounds += 1
+        snapshots = [replica.snapshot() for replica in replicas]
+        for index, replica in enumerate(replicas):
+            peer = rng.choice([i for i in range(nodes) if i != index])
+            replica.merge(snapshots[peer])
+    convergence = time.perf_counter() - start
+    
+    # Each distinct key counts once, however many nodes applied it
+    applied = {kind: set().union(*(keys[kind] for _, _, keys in results))
+               for kind in ("like", "unlike", "comment")}
+    cross_node = sum(len(keys["like"]) for _, _, keys in results) - len(applied["like"])
+    expected_likes = len(applied["like"]) - len(applied["unlike"])
+    print(f"Converged after {rounds} gossip rounds in {convergence * 1000:.1f} ms")
+    print(f"Likes: {replicas[0].likes_count} (expected {expected_likes}, "
+          f"{cross_node:,} likes applied on more than one node) | "
+          f"Comments: {len(replicas[0].comments)} (expected {len(applied['comment'])})")
+
+# Uncomment simulate_engagement_replication() in the main block to run the
+# multi-process CRDT simulation
+
+
+def benchmark_hot_posts(num_posts: int = 1_000_000, num_events: int = 1_000_000):
+    """Time leaderboard updates and top-100 reads with a million active posts."""
+    print(f"\n=== Hot posts benchmark: {num_posts:,} posts, {num_events:,} events ===")
+    rng = random.Random(42)
+    board = HotPostLeaderboard()
+    now = time.time()
+    start = time.perf_counter()
+    for post_id in range(num_posts):
+        board.record(post_id, HotPostLeaderboard.POST, now - rng.uniform(0, 86_400))
+    print(f"Created posts: {(time.perf_counter() - start) / num_posts * 1e6:.2f} µs/post")
+    
+    # Engagement is skewed: most events hit a small set of popular posts
+    events = [(int(num_posts * rng.random() ** 4),
+               HotPostLeaderboard.LIKE if rng.random() < 0.8 else HotPostLeaderboard.COMMENT)
+              for _ in range(num_events)]
+    start = time.perf_counter()
+    for post_id, event in events:
+        board.record(post_id, event, now)
+    print(f"Recorded events: {(time.perf_counter() - start) / num_events * 1e6:.2f} µs/event")
+    
+    reads = 10_000
+    start = time.perf_counter()
+    for _ in range(reads):
+        board.top(100)
+    print(f"Top-100 read: {(time.perf_counter() - start) / reads * 1e6:.2f} µs/read")
+
+# Uncomment to run the leaderboard benchmark
+# benchmark_hot_posts()
+
+
+def benchmark_hashtag_autocomplete(num_tags: int = 1_000_000, num_lookups: int = 100_000):
+    """Measure autocomplete memory per tag and lookup latency, projected to 10M tags."""
+    print(f"\n=== Hashtag autocomplete benchmark: {num_tags:,} tags ===")
+    rng = random.Random(21)
+    letters = "abcdefghijklmnopqrstuvwxyz0123456789"
+    tags = ["#" + "".join(rng.choices(letters, k=rng.randint(4, 20))) for _ in range(num_tags)]
+    gc.collect()
+    tracemalloc.start()
+    index = HashtagAutocomplete()
+    start = time.perf_counter()
+    for tag in tags:
+        index.record(tag)
+    build_time = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_tag = used / len(index)
+    print(f"Built in {build_time:.1f}s | {used / 2**20:,.0f} MiB = {per_tag:,.0f} bytes/tag | "
+          f"Projected at 10M tags: {per_tag * 10_000_000 / 2**30:.1f} GiB")
+    
+    prefixes = [tag[:rng.randint(2, len(tag))] for tag in rng.sample(tags, num_lookups)]
+    start = time.perf_counter()
+    for prefix in prefixes:
+        index.suggest(prefix)
+    print(f"Suggest: {(time.perf_counter() - start) / num_lookups * 1e6:.2f} µs/lookup")
+
+# Uncomment to run the hashtag autocomplete benchmark
+# benchmark_hashtag_autocomplete()
 
 
 # =============================================================================
@@ -687,9 +1227,12 @@ Requirements:
   - semester (string): Current semester
   - year (int): Academic year
   - max_capacity (int): Maximum students allowed
-  - enrolled_students (list): list of enrolled student names
-  - waitlist (list): list of waitlisted student names
+  - enrolled_students (dict): enrolled student names in enrollment order
+  - waitlist (IndexedWaitlist): waitlisted student names in arrival order
   - prerequisites (list): list of prerequisite course codes
+  - meetings (list): weekly (start, end) meeting times in minutes since Monday
+  - meeting_rooms (list): room of each meeting (or None), in the same order
+  - room (string or None): Default room for meetings added without one
 
 3. Advanced Methods:
   - __init__(): Initialize with full validation
@@ -728,12 +1271,22 @@ Expected Advanced Features:
 - Robust error handling
 """
 
+
+# The indexes and schedulers the Challenge Problem builds on live in practice_helpers.py.
+
+
 class Course:
    university_name = "Python University"
    total_courses = 0
    course_code_counter = 1000
    valid_departments = ["CS", "EE", "MATH", "PHYS", "CHEM"]
    semester_options = ["Fall", "Spring", "Summer"]
+   _counter_lock = threading.Lock()     # makes course code assignment atomic
+   prerequisite_graph = PrerequisiteGraph()  # catalog-wide prerequisite DAG
+   student_schedules = ScheduleIndex()  # (student, semester, year) -> booked meetings
+   room_schedules = ScheduleIndex()     # (room, semester, year) -> booked meetings
+   catalog_stats = CatalogStatistics()  # university-wide totals for the dashboard
+   catalog = CourseCatalog()            # lookups by department/semester/year/instructor/credits
    
    def __init__(self, title: str, department: str, credits: int, 
                 instructor: str, semester: str, year: int, max_capacity: int):
@@ -743,20 +1296,10 @@ class Course:
        This is the most complex constructor in our exercises.
        TODO: Implement with full validation and setup
        """
-       if not title or not isinstance(title, str):
-           raise ValueError("Title must be a non-empty string.")
-       if department not in Course.valid_departments:
-           raise ValueError(f"Department must be one of {Course.valid_departments}.")
-       if not isinstance(credits, int) or not (1 <= credits <= 6):
-           raise ValueError("Credits must be an integer between 1 and 6.")
-       if instructor and not isinstance(instructor, str):
-           raise ValueError("Instructor must be a non-empty string.")
-       if semester not in Course.semester_options:
-           raise ValueError(f"Semester must be one of {Course.semester_options}.")
-       if not isinstance(year, int) or not (datetime.now().year - 2 <= year <= datetime.now().year + 2):
-           raise ValueError("Year must be within 2 years of the current year.")
-       if not isinstance(max_capacity, int) or max_capacity <= 0:
-           raise ValueError("Max capacity must be a positive integer.")
+       for name, value in (("title", title), ("department", department), ("credits", credits),
+                           ("instructor", instructor), ("semester", semester), ("year", year),
+                           ("max_capacity", max_capacity)):
+           Course._check_field(name, value)
        self.title = title
        self.department = department
        self.credits = credits
@@ -764,12 +1307,80 @@ class Course:
        self.semester = semester
        self.year = year
        self.max_capacity = max_capacity
-       self.course_code = f"{department}{Course.course_code_counter}"
-       self.enrolled_students = []
-       self.waitlist = []
+       with Course._counter_lock:
+           self.course_code = f"{department}{Course.course_code_counter}"
+           Course.total_courses += 1
+           Course.course_code_counter += 1
+       self.enrolled_students = {}      # name -> None; a dict keeps enrollment order
+       self.waitlist = IndexedWaitlist()
        self.prerequisites = []
-       Course.total_courses += 1
-       Course.course_code_counter += 1
+       self.meetings = []
+       self.meeting_rooms = []
+       self.room = None
+       Course.prerequisite_graph.index_of(self.course_code)
+       # One re-entrant lock per course: drop_student() calls
+       # promote_from_waitlist() while holding it, and different courses
+       # never contend with each other.
+       self._lock = threading.RLock()
+       Course.catalog_stats.record(self)
+       Course.catalog.add(self)
+   
+   @staticmethod
+   def reset_catalog() -> None:
+       """
+       Forget every course and start the shared indexes afresh.
+       
+       Demos and benchmarks call this first so rankings and totals only
+       cover their own courses. Course codes keep counting up, so they
+       never repeat.
+       """
+       Course.total_courses = 0
+       Course.prerequisite_graph = PrerequisiteGraph()
+       Course.student_schedules = ScheduleIndex()
+       Course.room_schedules = ScheduleIndex()
+       Course.catalog_stats = CatalogStatistics()
+       Course.catalog = CourseCatalog()
+   
+   @staticmethod
+   def _check_field(name: str, value) -> None:
+       """Apply the constructor's validation to one field (other names pass)."""
+       if name == "title" and (not value or not isinstance(value, str)):
+           raise ValueError("Title must be a non-empty string.")
+       if name == "department" and value not in Course.valid_departments:
+           raise ValueError(f"Department must be one of {Course.valid_departments}.")
+       if name == "credits" and (not isinstance(value, int) or not (1 <= value <= 6)):
+           raise ValueError("Credits must be an integer between 1 and 6.")
+       if name == "instructor" and value and not isinstance(value, str):
+           raise ValueError("Instructor must be a non-empty string.")
+       if name == "semester" and value not in Course.semester_options:
+           raise ValueError(f"Semester must be one of {Course.semester_options}.")
+       if name == "year" and (not isinstance(value, int)
+                              or not (datetime.now().year - 2 <= value <= datetime.now().year + 2)):
+           raise ValueError("Year must be within 2 years of the current year.")
+       if name == "max_capacity" and (not isinstance(value, int) or value <= 0):
+           raise ValueError("Max capacity must be a positive integer.")
+   
+   def __setattr__(self, name, value):
+       """Validate edits and keep the catalog indexes and statistics in step."""
+       if "_lock" not in self.__dict__:  # still inside __init__, which validated already
+           object.__setattr__(self, name, value)
+           return
+       Course._check_field(name, value)
+       with self._lock:
+           # Timetable reservations are filed under (name, semester, year),
+           # so a course can't change term once any have been made.
+           if (name in ("semester", "year") and value != getattr(self, name)
+                   and (self.meetings or self.enrolled_students)):
+               raise ValueError(f"Cannot change the term of {self.course_code} "
+                                f"while it has meetings or enrolled students.")
+           object.__setattr__(self, name, value)
+           if name in CourseCatalog.FIELDS:
+               Course.catalog.add(self)
+           if name == "max_capacity":
+               while self.promote_from_waitlist() is not None:
+                   pass
+           if name in ("department", "semester", "year", "max_capacity"):
+               Course.catalog_stats.record(self)
    
    def enroll_student(self, student_name: str) -> str:
        """
@@ -781,8 +1392,25 @@ class Course:
        - Add to waitlist if course is full
        - Return appropriate message
        """
-       # Your implementation here
-       pass
+       if not student_name or not isinstance(student_name, str):
+           raise ValueError("Student name must be a non-empty string.")
+       with self._lock:
+           if student_name in self.enrolled_students:
+               return f"{student_name} is already enrolled in {self.course_code}."
+           if student_name in self.waitlist:
+               return f"{student_name} is already on the waitlist for {self.course_code}."
+           if self.is_full() or self.waitlist:  # nobody jumps an existing waitlist
+               self.waitlist.append(student_name)
+               Course.catalog_stats.record(self)
+               reason = "is full" if self.is_full() else "has a waitlist"
+               return (f"{self.course_code} {reason}. {student_name} added to the waitlist "
+                       f"(position {len(self.waitlist)}).")
+           conflict = self._reserve_schedule(student_name)
+           if conflict is not None:
+               return f"{student_name} cannot enroll in {self.course_code}: schedule conflicts with {conflict}."
+           self.enrolled_students[student_name] = None
+           Course.catalog_stats.record(self)
+           return f"{student_name} enrolled in {self.course_code}. Spots left: {self.get_available_spots()}"
    
    def drop_student(self, student_name: str) -> str:
        """
@@ -793,43 +1421,141 @@ class Course:
        - If removed from enrolled, promote from waitlist
        - Return appropriate message
        """
-       # Your implementation here
-       pass
+       with self._lock:
+           if student_name in self.enrolled_students:
+               del self.enrolled_students[student_name]
+               Course.student_schedules.release(self._schedule_key(student_name), self.course_code)
+               promoted = self.promote_from_waitlist()   # also updates catalog_stats
+               promoted_str = f" {promoted} promoted from the waitlist." if promoted else ""
+               return f"{student_name} dropped {self.course_code}.{promoted_str}"
+           if student_name in self.waitlist:
+               self.waitlist.remove(student_name)
+               Course.catalog_stats.record(self)
+               return f"{student_name} removed from the waitlist for {self.course_code}."
+           return f"{student_name} is not registered for {self.course_code}."
    
    def add_prerequisite(self, course_code: str) -> str:
        """Add a prerequisite course."""
-       # Your implementation here
-       pass
+       if not course_code or not isinstance(course_code, str):
+           raise ValueError("Prerequisite course code must be a non-empty string.")
+       if not Course.prerequisite_graph.add_prerequisite(self.course_code, course_code):
+           return f"{course_code} is already a prerequisite for {self.course_code}."
+       self.prerequisites.append(course_code)
+       return f"{course_code} added as a prerequisite for {self.course_code}."
+   
+   def get_all_prerequisites(self) -> list[str]:
+       """Every course needed before this one, including indirect prerequisites."""
+       return Course.prerequisite_graph.all_prerequisites(self.course_code)
+   
+   def meets_prerequisites(self, completed_courses) -> bool:
+       """Check whether a student who completed these course codes may enroll."""
+       graph = Course.prerequisite_graph
+       return graph.is_eligible(self.course_code, graph.mask_of(completed_courses))
    
    def check_enrollment_status(self, student_name: str) -> str:
        """Check if student is enrolled, waitlisted, or not registered."""
-       # Your implementation here
-       pass
+       with self._lock:
+           if student_name in self.enrolled_students:
+               return f"{student_name} is enrolled in {self.course_code}."
+           if student_name in self.waitlist:
+               return f"{student_name} is waitlisted for {self.course_code}."
+           return f"{student_name} is not registered for {self.course_code}."
    
    def get_available_spots(self) -> int:
        """Calculate remaining capacity."""
-       # Your implementation here
-       pass
+       return max(0, self.max_capacity - len(self.enrolled_students))
    
    def promote_from_waitlist(self) -> Optional[str]:
        """Move first waitlisted student to enrolled."""
-       # Your implementation here
-       pass
+       with self._lock:
+           # Students whose timetable changed while they waited and now
+           # clash with this course lose their waitlist place.
+           promoted = None
+           while self.waitlist and not self.is_full():
+               student_name = self.waitlist.popleft()
+               if self._reserve_schedule(student_name) is None:
+                   self.enrolled_students[student_name] = None
+                   promoted = student_name
+                   break
+           Course.catalog_stats.record(self)
+           return promoted
+   
+   def _schedule_key(self, name: str) -> tuple:
+       return (name, self.semester, self.year)
+   
+   def _reserve_schedule(self, student_name: str) -> Optional[str]:
+       """Book this course's meetings for the student; return a clashing course code."""
+       if not self.meetings:
+           return None
+       return Course.student_schedules.reserve(
+           self._schedule_key(student_name), self.meetings, self.course_code)
+   
+   def add_meeting(self, day: str, start: str, end: str, room: Optional[str] = None) -> str:
+       """Add a weekly meeting, e.g. add_meeting("Mon", "09:00", "10:15", "ENG-101")."""
+       start_minute, end_minute = week_minute(day, start), week_minute(day, end)
+       if end_minute <= start_minute:
+           raise ValueError("Meeting must end after it starts.")
+       with self._lock:
+           if self.enrolled_students:
+               raise ValueError("Meetings must be scheduled before students enroll.")
+           # Reservations rely on a course's own meetings never overlapping
+           for other_start, other_end in self.meetings:
+               if start_minute < other_end and other_start < end_minute:
+                   raise ValueError(f"{self.course_code} already meets during {day} {start}-{end}.")
+           room = room or self.room
+           if room is not None:
+               conflict = Course.room_schedules.reserve(
+                   self._schedule_key(room), [(start_minute, end_minute)], self.course_code)
+               if conflict is not None:
+                   raise ValueError(f"Room {room} is already booked by {conflict} at that time.")
+               if self.room is None:
+                   self.room = room
+           self.meetings.append((start_minute, end_minute))
+           self.meeting_rooms.append(room)
+       return f"{self.course_code} meets {day} {start}-{end}" + (f" in {room}." if room else ".")
+   
+   @staticmethod
+   def find_all_conflicts(courses) -> list[tuple[object, str, str]]:
+       """Room and instructor clashes across many sections, in one sweep."""
+       def bookings():
+           for course in courses:
+               for meeting, room in zip(course.meetings, course.meeting_rooms):
+                   term = (course.semester, course.year)
+                   if room is not None:
+                       yield ("room", room, *term), course.course_code, meeting
+                   if course.instructor:
+                       yield ("instructor", course.instructor, *term), course.course_code, meeting
+       return find_schedule_conflicts(bookings())
+   
+   @staticmethod
+   def find_courses(department: Optional[str] = None, semester: Optional[str] = None,
+                    year: Optional[int] = None, instructor: Optional[str] = None,
+                    min_credits: Optional[int] = None, max_credits: Optional[int] = None) -> Iterator["Course"]:
+       """e.g. find_courses(department="CS", semester="Fall", year=2025, instructor="Dr. Smith")"""
+       return Course.catalog.query(department, semester, year, instructor, min_credits, max_credits)
    
    def get_course_statistics(self) -> str:
        """Return comprehensive course statistics."""
-       # Your implementation here
-       pass
+       with self._lock:
+           enrolled, waitlisted = len(self.enrolled_students), len(self.waitlist)
+       department = Course.catalog_stats.group_totals("department", self.department)
+       return (f"{self.course_code} - {self.title} ({self.semester} {self.year}, {self.instructor})\n"
+               f"Enrolled: {enrolled}/{self.max_capacity} ({enrolled / self.max_capacity:.0%} full) | "
+               f"Waitlist: {waitlisted} | Spots left: {max(0, self.max_capacity - enrolled)}\n"
+               f"{self.department} department: {department['fill_rate']:.0%} full across "
+               f"{department['courses']} courses")
    
    def is_full(self) -> bool:
        """Check if course is at maximum capacity."""
-       # Your implementation here
-       pass
+       return len(self.enrolled_students) >= self.max_capacity
    
    def get_class_roster(self) -> str:
        """Return formatted list of enrolled students."""
-       # Your implementation here
-       pass
+       if not self.enrolled_students:
+           return f"{self.course_code} - {self.title}: no students enrolled."
+       lines = [f"{self.course_code} - {self.title} ({len(self.enrolled_students)}/{self.max_capacity})"]
+       lines += [f"{i}. {name}" for i, name in enumerate(self.enrolled_students, 1)]
+       return "\n".join(lines)
    
    def __str__(self) -> str:
        """Professional human-readable representation."""
@@ -842,10 +1568,293 @@ class Course:
        pass
 
 
+def _lottery_number(seed: int, student_name: str) -> int:
+    """Reproducible lottery draw: the same seed and student always tie-break alike."""
+    digest = hashlib.blake2b(f"{seed}:{student_name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _plan_course_batch(jobs: list[tuple]) -> list[tuple[str, list[str], list[str]]]:
+    """
+    Decide enrollments for a list of courses.
+
+    Each job is (course_code, open_seats, already_registered, requests) with
+    requests as (priority, lottery number, sequence, student) tuples, so a
+    plain sort serves them in the right order.
+    """
+    plans = []
+    for course_code, open_seats, already_registered, requests in jobs:
+        requests.sort()
+        # dict.fromkeys drops repeat requests but keeps each student's best rank
+        ranked = dict.fromkeys([request[3] for request in requests])
+        for student in already_registered:
+            ranked.pop(student, None)
+        students = list(ranked)
+        plans.append((course_code, students[:open_seats], students[open_seats:]))
+    return plans
+
+
+# The window a forked planner process works on: (requests, course_code ->
+# (partition, open seats, registered students), seed). It is handed to
+# _init_planner as an initializer argument, which a forked worker inherits
+# rather than unpickles, and it is only ever set inside pool workers, so
+# engines planning at the same time in different threads don't share it.
+_planner_window = None
+
+
+def _init_planner(window: tuple) -> None:
+    global _planner_window
+    _planner_window = window
+
+
+def _plan_partition(partition: int, window: Optional[tuple] = None) -> list[tuple[str, list[str], list[str]]]:
+    """Group, rank and plan the requests for one partition of the courses."""
+    requests, course_state, seed = window if window is not None else _planner_window
+    grouped, lottery = {}, {}
+    for sequence, (student_name, course_code, priority) in enumerate(requests):
+        if course_state[course_code][0] != partition:
+            continue
+        draw = lottery.get(student_name)
+        if draw is None:                # one draw per student, not per request
+            draw = lottery[student_name] = _lottery_number(seed, student_name)
+        grouped.setdefault(course_code, []).append((priority, draw, sequence, student_name))
+    return _plan_course_batch([(course_code, *course_state[course_code][1:], grouped[course_code])
+                               for course_code in sorted(grouped)])
+
+
+class BatchRegistrationEngine:
+    """
+    Process a whole registration window of ranked course requests at once.
+
+    Requests are (student_name, course_code, priority) tuples; lower priority
+    numbers go first (e.g. 0 for seniors), ties are broken by a seeded
+    lottery, then by submission order, so the same input and seed always
+    give the same result. Courses are split into one partition per process
+    (never more processes than CPUs) and planned independently; each forked
+    planner inherits the request list instead of receiving a pickled copy,
+    which would cost more than the planning itself. The plans are then
+    applied to the Course objects in course-code order.
+
+    Courses are planned independently, so cross-course rules (prerequisites)
+    should be enforced on the request list first; apply() re-checks
+    capacity and timetable clashes as it enrolls.
+    """
+
+    def __init__(self, seed: int = 0, processes: int = 4, parallel_threshold: int = 200_000):
+        self.seed = seed
+        self.processes = processes
+        self.parallel_threshold = parallel_threshold
+
+    def plan(self, courses: dict[str, "Course"], requests) -> dict[str, tuple[list[str], list[str]]]:
+        """Return course_code -> (students to enroll, students to waitlist)."""
+        requests = requests if isinstance(requests, list) else list(requests)
+        requested = {request[1] for request in requests}
+        for course_code in requested:
+            if course_code not in courses:
+                raise ValueError(f"Unknown course code: {course_code}")
+        # More planners than CPUs only adds fork and merge overhead
+        processes = min(self.processes, os.cpu_count() or 1)
+        parallel = (processes > 1 and len(requests) >= self.parallel_threshold
+                    and "fork" in multiprocessing.get_all_start_methods())
+        partitions = processes if parallel else 1
+        course_state = {}
+        for number, course_code in enumerate(sorted(requested)):
+            course = courses[course_code]
+            with course._lock:
+                registered = list(course.enrolled_students) + list(course.waitlist)
+                course_state[course_code] = (number % partitions, course.get_available_spots(), registered)
+        
+        window = (requests, course_state, self.seed)
+        if parallel:
+            with multiprocessing.get_context("fork").Pool(partitions, _init_planner, (window,)) as pool:
+                results = pool.map(_plan_partition, range(partitions))
+        else:
+            results = [_plan_partition(0, window)]
+        return {course_code: (enrolled, waitlisted)
+                for plans in results for course_code, enrolled, waitlisted in plans}
+
+    @staticmethod
+    def apply(courses: dict[str, "Course"], plan: dict[str, tuple[list[str], list[str]]]) -> str:
+        """
+        Write a plan into the Course objects; return a summary line.
+
+        The plan may be stale by now (other enrollments, or another plan
+        applied first), so every student is re-checked under the course
+        lock: anyone already registered is skipped, planned enrollments
+        book the student's timetable (a clash rejects them, as
+        enroll_student() does) and go to the waitlist once the course is full.
+        """
+        enrolled_total = waitlisted_total = rejected_total = 0
+        for course_code in sorted(plan):
+            enrolled, waitlisted = plan[course_code]
+            course = courses[course_code]
+            with course._lock:
+                roster, waitlist = course.enrolled_students, course.waitlist
+                # Nobody jumps an existing waitlist, even if seats have opened up
+                open_seats = 0 if waitlist else course.get_available_spots()
+                for student_name in itertools.chain(enrolled, waitlisted):
+                    if student_name in roster or student_name in waitlist:
+                        continue
+                    if not open_seats:
+                        waitlist.append(student_name)
+                        waitlisted_total += 1
+                    elif course._reserve_schedule(student_name) is None:
+                        roster[student_name] = None
+                        open_seats -= 1
+                        enrolled_total += 1
+                    else:
+                        rejected_total += 1
+                Course.catalog_stats.record(course)
+        rejected_str = f", {rejected_total} rejected for schedule conflicts" if rejected_total else ""
+        return (f"Batch registration: {enrolled_total} enrolled, {waitlisted_total} waitlisted "
+                f"across {len(plan)} courses{rejected_str}")
+
+    def run(self, courses: dict[str, "Course"], requests) -> str:
+        """Plan and apply a registration window."""
+        return self.apply(courses, self.plan(courses, requests))
+
+
+class SectionAssignmentOptimizer:
+    """
+    Place each student in one section from a ranked preference list.
+
+    Uses student-proposing deferred acceptance (Gale-Shapley): every student
+    proposes to their next choice, and a full section bumps its weakest
+    tentative student when a stronger one applies. Sections rank students by
+    priority (lower first), then by the same seeded lottery the batch engine
+    uses. The result is stable - no student and section both prefer each
+    other to what they got - and no student can do better by misreporting
+    their preferences. Each proposal is a heap operation, so a campus of
+    40k students x 6 choices settles in well under a second.
+
+    Students who cannot be placed anywhere are waitlisted on their first
+    choice, best-ranked first. Sections that clash with a student's current
+    timetable are skipped while matching, and run() applies the plan with
+    BatchRegistrationEngine.apply(), which re-checks capacity and books
+    each student's timetable.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def plan(self, courses: dict[str, "Course"], preferences: dict[str, list[str]],
+             priorities: Optional[dict[str, int]] = None) -> dict[str, tuple[list[str], list[str]]]:
+        """Return course_code -> (students to enroll, students to waitlist)."""
+        priorities = priorities or {}
+        open_seats, registered, clashes = {}, {}, set()
+        for student_name, choices in preferences.items():
+            for course_code in choices:
+                if course_code not in courses:
+                    raise ValueError(f"Unknown course code: {course_code}")
+                course = courses[course_code]
+                if course_code not in open_seats:
+                    with course._lock:
+                        open_seats[course_code] = course.get_available_spots()
+                        registered[course_code] = set(course.enrolled_students) | set(course.waitlist)
+                if course.meetings and Course.student_schedules.find_conflict(
+                        course._schedule_key(student_name), course.meetings) is not None:
+                    clashes.add((student_name, course_code))
+
+        # A section keeps its tentative students in a heap with the weakest
+        # on top: (-priority, -lottery) orders the worst-ranked student first.
+        rank = {student_name: (-priorities.get(student_name, 0), -_lottery_number(self.seed, student_name))
+                for student_name in preferences}
+        held = {course_code: [] for course_code in open_seats}
+        next_choice = dict.fromkeys(preferences, 0)
+        free = list(preferences)
+        while free:
+            student_name = free.pop()
+            choices = preferences[student_name]
+            while next_choice[student_name] < len(choices):
+                course_code = choices[next_choice[student_name]]
+                next_choice[student_name] += 1
+                if (student_name in registered[course_code] or open_seats[course_code] == 0
+                        or (student_name, course_code) in clashes):
+                    continue
+                entry = (*rank[student_name], student_name)
+                section = held[course_code]
+                if len(section) < open_seats[course_code]:
+                    heapq.heappush(section, entry)
+                    break
+                if entry > section[0]:
+                    bumped = heapq.heapreplace(section, entry)
+                    free.append(bumped[2])
+                    break
+
+        plan = {course_code: (sorted(section, reverse=True), []) for course_code, section in held.items()}
+        placed = {entry[2] for enrolled, _ in plan.values() for entry in enrolled}
+        for course_code, (enrolled, _) in plan.items():
+            enrolled[:] = [entry[2] for entry in enrolled]
+        overflow = {}
+        for student_name, choices in preferences.items():
+            if (student_name not in placed and choices and student_name not in registered[choices[0]]
+                    and (student_name, choices[0]) not in clashes):
+                overflow.setdefault(choices[0], []).append((*rank[student_name], student_name))
+        for course_code, entries in overflow.items():
+            entries.sort(reverse=True)
+            plan[course_code][1].extend(entry[2] for entry in entries)
+        return plan
+
+    def run(self, courses: dict[str, "Course"], preferences: dict[str, list[str]],
+            priorities: Optional[dict[str, int]] = None) -> str:
+        """Plan and apply an assignment round."""
+        return BatchRegistrationEngine.apply(courses, self.plan(courses, preferences, priorities))
+
+
+class DegreeAuditEngine:
+    """
+    Prerequisite checks for a whole student body, as bitset subset tests.
+
+    A transcript is an int bitset over the prerequisite graph's dense course
+    indexes, the same encoding as the graph's cached closures, so a student
+    may take a course when closure & ~transcript == 0. audit() only looks up
+    closures for the courses a batch actually asks about, so a small audit
+    costs O(requests) however large the catalog is.
+    """
+
+    def __init__(self, graph: Optional[PrerequisiteGraph] = None):
+        self.graph = graph if graph is not None else Course.prerequisite_graph
+        self._transcripts = {}            # student -> bitset of completed courses
+
+    def record_completion(self, student_name: str, *course_codes: str) -> None:
+        """Add completed courses to a student's transcript."""
+        unknown = [code for code in course_codes if code not in self.graph]
+        if unknown:
+            raise ValueError(f"Unknown course codes: {', '.join(unknown)}")
+        self._transcripts[student_name] = (self._transcripts.get(student_name, 0)
+                                           | self.graph.mask_of(course_codes))
+
+    def transcript(self, student_name: str) -> list[str]:
+        """Completed course codes, in catalog index order."""
+        return self.graph.codes_in(self._transcripts.get(student_name, 0))
+
+    def missing_prerequisites(self, student_name: str, course_code: str) -> list[str]:
+        """Prerequisites of course_code the student has not completed."""
+        if course_code not in self.graph:
+            return []
+        needed = self.graph.closure(self.graph.index_of(course_code))
+        return self.graph.codes_in(needed & ~self._transcripts.get(student_name, 0))
+
+    def remaining_requirements(self, student_name: str, required_codes) -> list[str]:
+        """Courses in a degree's requirement list the student still needs."""
+        required = self.graph.mask_of(required_codes)
+        return self.graph.codes_in(required & ~self._transcripts.get(student_name, 0))
+
+    def audit(self, requests) -> list[bool]:
+        """Eligibility of each (student_name, course_code) request, in order."""
+        requests = list(requests)
+        # Codes outside the graph have no prerequisites, so they get no closure.
+        closures = {code: self.graph.closure(index)
+                    for code, index in self.graph.indexes_of(code for _, code in requests).items()}
+        transcripts = self._transcripts
+        return [not closures.get(code, 0) & ~transcripts.get(name, 0) for name, code in requests]
+
+
 # Test cases for Challenge Problem
 def test_course_class():
    """Test the advanced Course class implementation."""
    print("\n=== Testing Challenge Problem: Course Class ===")
+   Course.reset_catalog()
    
    try:
        # Create courses
@@ -864,9 +1873,73 @@ def test_course_class():
        # Test dropping and promotion
        print(course1.drop_student("Alice"))  # Should promote from waitlist
        
+       # Test timetable conflicts
+       course3 = Course("Linear Algebra", "MATH", 3, "Prof. Lee", "Fall", 2024, 30)
+       course4 = Course("Physics I", "PHYS", 4, "Dr. Curie", "Fall", 2024, 30)
+       print(course3.add_meeting("Mon", "09:00", "10:15", "ENG-101"))
+       print(course4.add_meeting("Mon", "10:00", "11:00", "SCI-200"))
+       print(course3.enroll_student("Grace"))
+       print(course4.enroll_student("Grace"))  # Clashes with course3
+       try:
+           course4.add_meeting("Mon", "09:30", "10:00", "ENG-101")  # Room taken
+       except ValueError as e:
+           print(f"Error: {e}")
+       print(course4.add_meeting("Wed", "14:00", "16:00", "LAB-3"))  # Each meeting keeps its room
+       try:
+           course4.add_meeting("Mon", "10:30", "11:30")  # Overlaps its own Monday meeting
+       except ValueError as e:
+           print(f"Error: {e}")
+       print("Room/instructor clashes:", Course.find_all_conflicts([course3, course4]))
+       
+       # Test prerequisites (cycles are rejected)
+       print(course1.add_prerequisite(course2.course_code))
+       print(course2.add_prerequisite("MATH0100"))
+       print(f"All prerequisites of {course1.course_code}: {course1.get_all_prerequisites()}")
+       print(f"Study order: {Course.prerequisite_graph.study_order(course1.course_code)}")
+       print(f"Eligible with MATH0100 only: {course1.meets_prerequisites(['MATH0100'])}")
+       try:
+           course2.add_prerequisite(course1.course_code)
+       except ValueError as e:
+           print(f"Error: {e}")
+       
+       # Test batch registration (seniors first, then lottery)
+       seminar = Course("Python Seminar", "CS", 1, "Dr. Smith", "Fall", 2024, 2)
+       window = [("Hank", seminar.course_code, 1), ("Ivy", seminar.course_code, 0),
+                 ("Jack", seminar.course_code, 1), ("Kim", seminar.course_code, 1)]
+       print(BatchRegistrationEngine(seed=2024).run({seminar.course_code: seminar}, window))
+       print(f"Enrolled: {list(seminar.enrolled_students)} | Waitlist: {list(seminar.waitlist)}")
+       
+       # Test preference-based section assignment
+       lab_a = Course("Python Lab A", "CS", 1, "Dr. Smith", "Fall", 2024, 1)
+       lab_b = Course("Python Lab B", "CS", 1, "Dr. Smith", "Fall", 2024, 1)
+       labs = {lab_a.course_code: lab_a, lab_b.course_code: lab_b}
+       preferences = {"Liam": [lab_a.course_code, lab_b.course_code],
+                      "Mia": [lab_a.course_code, lab_b.course_code],
+                      "Noah": [lab_a.course_code]}
+       print(SectionAssignmentOptimizer(seed=2024).run(labs, preferences, {"Mia": 0, "Liam": 1, "Noah": 1}))
+       for lab in labs.values():
+           print(f"{lab.course_code}: {list(lab.enrolled_students)} | Waitlist: {list(lab.waitlist)}")
+       
+       # Test degree audit (transcripts as bitsets)
+       audit = DegreeAuditEngine()
+       audit.record_completion("Olivia", "MATH0100", course2.course_code)
+       audit.record_completion("Pete", "MATH0100")
+       print(f"Olivia transcript: {audit.transcript('Olivia')}")
+       print(f"Audit for {course1.course_code}: "
+             f"{audit.audit([('Olivia', course1.course_code), ('Pete', course1.course_code)])}")
+       print(f"Pete is missing: {audit.missing_prerequisites('Pete', course1.course_code)}")
+       
        # Test statistics
        print(course1.get_course_statistics())
        print(course1.get_class_roster())
+       print(Course.catalog_stats.dashboard(top_n=3))
+       
+       # Test catalog lookups (indexes follow edits)
+       query = dict(department="CS", semester="Fall", year=2024, instructor="Dr. Smith")
+       print(Course.catalog.explain(**query))
+       print(f"CS Fall 2024 with Dr. Smith: {[c.course_code for c in Course.find_courses(**query)]}")
+       course2.instructor = "Dr. Smith"
+       print(f"Dr. Smith, 4+ credits: {[c.course_code for c in Course.find_courses(instructor='Dr. Smith', min_credits=4)]}")
        
        print(f"Total courses: {Course.total_courses}")
        
@@ -877,6 +1950,397 @@ def test_course_class():
 # test_course_class()
 
 
+def benchmark_course_enrollment(capacity: int = 50_000, extra_students: int = 10_000):
+    """Time enroll/drop/promote on a large lecture course."""
+    print(f"\n=== Course enrollment benchmark: {capacity:,} seats ===")
+    Course.reset_catalog()
+    course = Course("Intro to Computing", "CS", 3, "Dr. Smith", "Fall", datetime.now().year, capacity)
+    students = [f"student{i}" for i in range(capacity + extra_students)]
+    rng = random.Random(7)
+    
+    start = time.perf_counter()
+    for student in students:
+        course.enroll_student(student)
+    elapsed = time.perf_counter() - start
+    print(f"Enroll {len(students):,} (incl. {extra_students:,} waitlisted): "
+          f"{elapsed / len(students) * 1e6:.2f} µs/op")
+    
+    start = time.perf_counter()
+    for student in students:
+        course.check_enrollment_status(student)
+    print(f"Status checks: {(time.perf_counter() - start) / len(students) * 1e6:.2f} µs/op")
+    
+    waitlisted = rng.sample(students[capacity:], extra_students // 2)
+    start = time.perf_counter()
+    for student in waitlisted:
+        course.drop_student(student)
+    print(f"Drop from middle of waitlist: {(time.perf_counter() - start) / len(waitlisted) * 1e6:.2f} µs/op")
+    
+    dropped = rng.sample(students[:capacity], extra_students // 2)
+    start = time.perf_counter()
+    for student in dropped:
+        course.drop_student(student)
+    print(f"Drop enrolled + promote: {(time.perf_counter() - start) / len(dropped) * 1e6:.2f} µs/op")
+    print(f"Enrolled: {len(course.enrolled_students):,} | Waitlist: {len(course.waitlist):,}")
+
+# Uncomment to run the enrollment benchmark
+# benchmark_course_enrollment()
+
+
+def simulate_registration_day(num_threads: int = 64, num_courses: int = 8, capacity: int = 200,
+                              operations_per_thread: int = 5_000):
+    """
+    Hammer a few popular courses from many threads at once.
+
+    Every thread mixes enrollments (80%) and drops (20%) for random students.
+    A monitor thread samples each course while the load runs; a sample with
+    more students enrolled than max_capacity counts as an oversell, as does a
+    student found both enrolled and waitlisted.
+    """
+    print(f"\n=== Registration day: {num_threads} threads, {num_courses} courses x {capacity} seats ===")
+    Course.reset_catalog()
+    year = datetime.now().year
+    courses = [Course(f"Popular Course {n}", "CS", 3, "Dr. Smith", "Fall", year, capacity)
+               for n in range(num_courses)]
+    start_gate = threading.Barrier(num_threads + 1)
+    done = threading.Event()
+    samples, oversold = [0], [0]
+    
+    def student_load(seed: int) -> None:
+        rng = random.Random(seed)
+        start_gate.wait()
+        for _ in range(operations_per_thread):
+            course = rng.choice(courses)
+            student = f"student{rng.randrange(capacity * 4)}"
+            if rng.random() < 0.8:
+                course.enroll_student(student)
+            else:
+                course.drop_student(student)
+    
+    def monitor() -> None:
+        while not done.is_set():
+            for course in courses:
+                with course._lock:
+                    samples[0] += 1
+                    if (len(course.enrolled_students) > course.max_capacity
+                            or any(name in course.waitlist for name in course.enrolled_students)):
+                        oversold[0] += 1
+            time.sleep(0.001)
+    
+    workers = [threading.Thread(target=student_load, args=(seed,)) for seed in range(num_threads)]
+    watcher = threading.Thread(target=monitor)
+    for thread in workers:
+        thread.start()
+    watcher.start()
+    start_gate.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+    
+    total_ops = num_threads * operations_per_thread
+    print(f"Throughput: {total_ops / elapsed:,.0f} ops/sec ({total_ops:,} ops in {elapsed:.2f}s)")
+    print(f"Oversell rate: {oversold[0]}/{samples[0]} samples "
+          f"({oversold[0] / max(1, samples[0]):.2%})")
+    for course in courses[:3]:
+        print(f"{course.course_code}: {len(course.enrolled_students)}/{course.max_capacity} enrolled, "
+              f"{len(course.waitlist)} waitlisted")
+
+# Uncomment to run the registration-day load generator
+# simulate_registration_day()
+
+
+def benchmark_prerequisite_graph(num_courses: int = 20_000, max_prerequisites: int = 3):
+    """Build a random 20k-course catalog and time closure and ordering queries."""
+    print(f"\n=== Prerequisite graph benchmark: {num_courses:,} courses ===")
+    rng = random.Random(11)
+    graph = PrerequisiteGraph()
+    codes = [f"C{n:05d}" for n in range(num_courses)]
+    start = time.perf_counter()
+    for n, code in enumerate(codes):
+        graph.index_of(code)
+        # Prerequisites come from the previous few hundred courses, so chains run deep
+        for _ in range(rng.randrange(max_prerequisites + 1) if n else 0):
+            graph.add_prerequisite(code, codes[rng.randrange(max(0, n - 300), n)])
+    print(f"Built catalog in {time.perf_counter() - start:.2f}s")
+    
+    queries = [rng.choice(codes) for _ in range(10_000)]
+    start = time.perf_counter()
+    for code in queries:
+        graph.closure(graph.index_of(code))
+    print(f"Closure (cold + warm mix): {(time.perf_counter() - start) / len(queries) * 1e6:.2f} µs/query")
+    
+    completed = graph.mask_of(rng.sample(codes, num_courses // 2))
+    start = time.perf_counter()
+    for code in queries:
+        graph.is_eligible(code, completed)
+    print(f"Eligibility check (cached): {(time.perf_counter() - start) / len(queries) * 1e6:.2f} µs/query")
+    
+    start = time.perf_counter()
+    for code in queries[:100]:
+        graph.study_order(code)
+    print(f"Study order: {(time.perf_counter() - start) / 100 * 1e3:.2f} ms/query")
+
+# Uncomment to run the prerequisite graph benchmark
+# benchmark_prerequisite_graph()
+
+
+def benchmark_timetable(num_sections: int = 100_000, num_rooms: int = 2_000):
+    """Time inline conflict checks and a full-semester conflict report."""
+    print(f"\n=== Timetable benchmark: {num_sections:,} sections, {num_rooms:,} rooms ===")
+    rng = random.Random(5)
+    bookings = []
+    for n in range(num_sections):
+        room = f"R{rng.randrange(num_rooms)}"
+        for day in rng.sample(range(5), 2):
+            start = day * 1440 + rng.randrange(8 * 60, 18 * 60, 15)
+            bookings.append((room, f"S{n}", (start, start + 75)))
+    
+    start = time.perf_counter()
+    conflicts = find_schedule_conflicts(bookings)
+    print(f"Full report: {len(conflicts):,} room conflicts in {time.perf_counter() - start:.2f}s")
+    
+    # Inline checks: one student's schedule grows as they try to enroll
+    index = ScheduleIndex()
+    attempts = 100_000
+    start = time.perf_counter()
+    for n in range(attempts):
+        student = f"student{n % 5_000}"
+        day_start = rng.randrange(5) * 1440 + rng.randrange(8 * 60, 18 * 60, 15)
+        index.reserve(student, [(day_start, day_start + 75)], f"S{n}")
+    print(f"Inline reserve with conflict check: {(time.perf_counter() - start) / attempts * 1e6:.2f} µs/op")
+
+# Uncomment to run the timetable benchmark
+# benchmark_timetable()
+
+
+def benchmark_batch_registration(num_courses: int = 2_000, num_students: int = 100_000,
+                                 choices_per_student: int = 5, processes: int = 4):
+    """Compare the batch engine with a per-call enroll_student loop on the same window."""
+    total = num_students * choices_per_student
+    print(f"\n=== Batch registration benchmark: {total:,} requests, {num_courses:,} courses ===")
+    Course.reset_catalog()
+    rng = random.Random(3)
+    year = datetime.now().year
+    
+    def make_catalog() -> dict[str, Course]:
+        courses = [Course(f"Section {n}", "CS", 3, "Staff", "Fall", year, 150) for n in range(num_courses)]
+        return {course.course_code: course for course in courses}
+    
+    batch_courses, loop_courses = make_catalog(), make_catalog()
+    batch_codes, loop_codes = list(batch_courses), list(loop_courses)
+    requests = []
+    for n in range(num_students):
+        priority = rng.randrange(4)       # 0 = seniors ... 3 = freshmen
+        for choice in rng.sample(range(num_courses), choices_per_student):
+            requests.append((f"student{n}", choice, priority))
+    
+    batch_requests = [(s, batch_codes[c], p) for s, c, p in requests]
+    
+    # Planning only: one process against a process pool (capped at the CPU count)
+    gc.collect()
+    start = time.perf_counter()
+    sequential_plan = BatchRegistrationEngine(seed=1, processes=1).plan(batch_courses, batch_requests)
+    sequential_time = time.perf_counter() - start
+    gc.collect()
+    start = time.perf_counter()
+    pool_plan = BatchRegistrationEngine(seed=1, processes=processes, parallel_threshold=0).plan(
+        batch_courses, batch_requests)
+    pool_time = time.perf_counter() - start
+    print(f"Plan with 1 process: {sequential_time:.2f}s | Plan with up to {processes} processes: "
+          f"{pool_time:.2f}s on {os.cpu_count()} CPU(s) | Same plan: {sequential_plan == pool_plan}")
+    
+    engine = BatchRegistrationEngine(seed=1, processes=processes)
+    gc.collect()
+    start = time.perf_counter()
+    print(engine.run(batch_courses, batch_requests))
+    batch_time = time.perf_counter() - start
+    
+    # Baseline: rank the same window (one lottery draw per student, as the
+    # engine does), then one enroll_student call per request
+    gc.collect()
+    start = time.perf_counter()
+    draws = {}
+    for student_name, _, _ in requests:
+        if student_name not in draws:
+            draws[student_name] = _lottery_number(1, student_name)
+    ranked = sorted(enumerate(requests), key=lambda item: (item[1][2], draws[item[1][0]], item[0]))
+    for _, (student_name, choice, _) in ranked:
+        loop_courses[loop_codes[choice]].enroll_student(student_name)
+    loop_time = time.perf_counter() - start
+    
+    same = all(list(a.enrolled_students) == list(b.enrolled_students)
+               and list(a.waitlist) == list(b.waitlist)
+               for a, b in zip(batch_courses.values(), loop_courses.values()))
+    print(f"Batch engine: {batch_time:.2f}s | Per-call loop: {loop_time:.2f}s | "
+          f"Speed-up: {loop_time / batch_time:.1f}x | Identical result: {same}")
+
+# Uncomment to run the batch registration benchmark
+# benchmark_batch_registration()
+
+
+def benchmark_section_assignment(num_students: int = 40_000, choices_per_student: int = 6,
+                                 num_sections: int = 1_200, section_size: int = 32):
+    """Run a campus-wide preference round and check the matching is stable."""
+    print(f"\n=== Section assignment benchmark: {num_students:,} students x "
+          f"{choices_per_student} choices, {num_sections:,} sections ===")
+    Course.reset_catalog()
+    rng = random.Random(11)
+    year = datetime.now().year
+    sections = [Course(f"Section {n}", "CS", 3, "Staff", "Fall", year, section_size)
+                for n in range(num_sections)]
+    courses = {course.course_code: course for course in sections}
+    codes = list(courses)
+    # Skewed popularity: a few sections are wanted by nearly everyone
+    weights = [1 / (n + 1) ** 0.8 for n in range(num_sections)]
+    preferences, priorities = {}, {}
+    for n in range(num_students):
+        choices = dict.fromkeys(rng.choices(codes, weights, k=choices_per_student * 2))
+        preferences[f"student{n}"] = list(choices)[:choices_per_student]
+        priorities[f"student{n}"] = rng.randrange(4)
+    
+    optimizer = SectionAssignmentOptimizer(seed=1)
+    start = time.perf_counter()
+    print(optimizer.run(courses, preferences, priorities))
+    elapsed = time.perf_counter() - start
+    
+    # Stability: nobody prefers a section that holds a weaker student or has room
+    assigned = {student: code for code, course in courses.items() for student in course.enrolled_students}
+    def rank(student):
+        return (-priorities[student], -_lottery_number(1, student))
+    weakest = {code: min(map(rank, course.enrolled_students), default=None) for code, course in courses.items()}
+    blocking = 0
+    for student, choices in preferences.items():
+        for code in choices:
+            if assigned.get(student) == code:
+                break
+            course = courses[code]
+            if not course.is_full() or rank(student) > weakest[code]:
+                blocking += 1
+                break
+    first_choice = sum(assigned.get(s) == c[0] for s, c in preferences.items())
+    print(f"Assigned {len(assigned):,}/{num_students:,} students in {elapsed:.2f}s | "
+          f"First choice: {first_choice / num_students:.0%} | Blocking pairs: {blocking}")
+
+# Uncomment to run the section assignment benchmark
+# benchmark_section_assignment()
+
+
+def benchmark_catalog_dashboard(num_courses: int = 5_000, num_events: int = 200_000):
+    """Compare the incremental dashboard with polling every course."""
+    print(f"\n=== Catalog dashboard benchmark: {num_courses:,} courses, {num_events:,} events ===")
+    Course.reset_catalog()
+    rng = random.Random(5)
+    year = datetime.now().year
+    courses = [Course(f"Section {n}", rng.choice(Course.valid_departments), 3, "Staff",
+                      rng.choice(Course.semester_options), year, rng.randint(10, 60))
+               for n in range(num_courses)]
+    start = time.perf_counter()
+    for n in range(num_events):
+        course = courses[rng.randrange(num_courses)]
+        if rng.random() < 0.8:
+            course.enroll_student(f"student{rng.randrange(num_events)}")
+        elif course.enrolled_students:
+            course.drop_student(next(iter(course.enrolled_students)))
+    event_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(100):
+        dashboard = Course.catalog_stats.dashboard()
+    incremental = (time.perf_counter() - start) / 100
+    
+    # Baseline: what every dashboard refresh costs without the aggregates
+    start = time.perf_counter()
+    fullest = heapq.nsmallest(5, courses, key=lambda c: (-len(c.enrolled_students) / c.max_capacity,
+                                                          -len(c.enrolled_students), c.course_code))
+    by_department = Counter()
+    for course in courses:
+        by_department[course.department] += len(course.enrolled_students)
+    polling = time.perf_counter() - start
+    
+    same = [c.course_code for c in fullest] == [code for code, _ in Course.catalog_stats.fullest_courses(5)]
+    print(dashboard)
+    print(f"{num_events:,} events in {event_time:.2f}s | Dashboard: {incremental * 1e3:.3f}ms | "
+          f"Polling every course: {polling * 1e3:.1f}ms | Same top 5: {same}")
+
+# Uncomment to run the catalog dashboard benchmark
+# benchmark_catalog_dashboard()
+
+
+def benchmark_catalog_queries(num_courses: int = 100_000, num_queries: int = 2_000):
+    """Compare indexed catalog queries with scanning every course."""
+    print(f"\n=== Catalog query benchmark: {num_courses:,} courses, {num_queries:,} queries ===")
+    Course.reset_catalog()
+    rng = random.Random(9)
+    years = [datetime.now().year + offset for offset in (-1, 0, 1)]
+    instructors = [f"Dr. Staff{n}" for n in range(2_000)]
+    courses = [Course(f"Section {n}", rng.choice(Course.valid_departments), rng.randint(1, 6),
+                      rng.choice(instructors), rng.choice(Course.semester_options), rng.choice(years), 30)
+               for n in range(num_courses)]
+    queries = [dict(department=rng.choice(Course.valid_departments), semester=rng.choice(Course.semester_options),
+                    year=rng.choice(years), instructor=rng.choice(instructors)) for _ in range(num_queries)]
+    
+    start = time.perf_counter()
+    indexed = [sorted(c.course_code for c in Course.find_courses(**query)) for query in queries]
+    indexed_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    scanned = [sorted(c.course_code for c in courses
+                      if all(getattr(c, field) == value for field, value in query.items()))
+               for query in queries[:num_queries // 20]]
+    scan_time = (time.perf_counter() - start) * 20
+    
+    print(Course.catalog.explain(**queries[0]))
+    print(f"Indexed: {indexed_time * 1e3 / num_queries:.3f}ms/query | "
+          f"Full scan: {scan_time * 1e3 / num_queries:.2f}ms/query | "
+          f"Speed-up: {scan_time / indexed_time:.0f}x | Same results: {indexed[:len(scanned)] == scanned}")
+
+# Uncomment to run the catalog query benchmark
+# benchmark_catalog_queries()
+
+
+def benchmark_degree_audit(num_courses: int = 2_000, num_students: int = 40_000, requests_per_student: int = 6):
+    """Compare bitset audits with walking prerequisite lists per request."""
+    total = num_students * requests_per_student
+    print(f"\n=== Degree audit benchmark: {total:,} requests, {num_courses:,} courses ===")
+    rng = random.Random(13)
+    graph = PrerequisiteGraph()
+    codes = [f"AUD{n}" for n in range(num_courses)]
+    for n in range(1, num_courses):
+        for prerequisite in rng.sample(range(max(0, n - 50), n), min(n, 2)):
+            graph.add_prerequisite(codes[n], codes[prerequisite])
+    engine = DegreeAuditEngine(graph)
+    transcripts = {}
+    for n in range(num_students):
+        # Students complete a prefix of the catalog plus some scattered courses
+        done = codes[:rng.randrange(num_courses // 2)] + rng.sample(codes, 20)
+        transcripts[f"student{n}"] = set(done)
+        engine.record_completion(f"student{n}", *done)
+    requests = [(f"student{rng.randrange(num_students)}", rng.choice(codes)) for _ in range(total)]
+    
+    gc.collect()    # don't bill either side for collecting the setup's garbage
+    start = time.perf_counter()
+    eligible = engine.audit(requests)
+    bitset_time = time.perf_counter() - start
+    
+    # Baseline: walk each course's prerequisite code list for every request
+    prerequisite_lists = {code: graph.all_prerequisites(code) for code in codes}
+    gc.collect()
+    start = time.perf_counter()
+    walked = [all(code in transcripts[student] for code in prerequisite_lists[course])
+              for student, course in requests]
+    walk_time = time.perf_counter() - start
+    
+    print(f"Eligible: {sum(eligible):,}/{total:,} | Bitset audit: {bitset_time:.2f}s | "
+          f"List walk: {walk_time:.2f}s | Speed-up: {walk_time / bitset_time:.1f}x | "
+          f"Same result: {eligible == walked}")
+
+# Uncomment to run the degree audit benchmark
+# benchmark_degree_audit()
+
+
 # =============================================================================
 # Main Execution
 # =============================================================================
@@ -894,8 +2358,9 @@ if __name__ == "__main__":
    # Uncomment to test specific problems:
    # test_book_class()           # Problem 1
    # test_employee_class()       # Problem 2  
-   # test_social_media_post()    # Problem 3
+   test_social_media_post()      # Problem 3
    # test_course_class()         # Challenge Problem
+   # simulate_engagement_replication()  # Problem 3, multi-process
    
    # Or run all tests:
    print("To run tests, uncomment the test function calls in the main block!")
@@ -0,0 +1,1999 @@
+"""
+Helpers for the Classes and Objects practice problems
+=====================================================
+
+The indexes, caches and schedulers that the Problem 3 (SocialMediaPost)
+and Challenge Problem (Course) solutions in practice-problems.py build on.
+They live here so the practice file reads as problem statement, class,
+then tests.
+"""
+
+import atexit
+import bisect
+import hashlib
+import heapq
+import math
+import multiprocessing
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Iterator, Optional
+
+# =============================================================================
+# Problem 3 helpers: Social Media Post System
+# =============================================================================
+
+# Full-text search over post content
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> list[str]:
+    """Split text into lowercase search terms ("#Python!" -> "python")."""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    """Append a non-negative int to out using 7 bits per byte."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varints(data: bytearray) -> Iterator[int]:
+    """Yield every varint stored in data, in order."""
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+class PostSearchIndex:
+    """
+    Inverted index over post content, ranked with BM25.
+
+    Each term owns a posting list: a bytearray of varint pairs
+    (doc number delta, term frequency). Doc numbers only ever grow, so the
+    deltas stay small and most entries take two bytes. Editing a post retires
+    its old doc number and indexes the new text under a fresh one; retired
+    entries are dropped by compact() once they outnumber the live ones.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}               # term -> bytearray of varint pairs
+        self._last_doc = {}               # term -> last doc number appended
+        self._doc_freq = Counter()        # term -> live documents containing it
+        self._doc_post_ids = array('q')   # doc number -> post_id (-1 if retired)
+        self._doc_lengths = array('I')    # doc number -> token count
+        self._current_doc = {}            # post_id -> live doc number
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._current_doc)
+
+    def add_post(self, post_id: int, text: str) -> None:
+        """Index text as the current version of post_id."""
+        if post_id in self._current_doc:
+            raise ValueError(f"Post {post_id} is already indexed.")
+        terms = _tokenize(text)
+        doc = len(self._doc_post_ids)
+        self._doc_post_ids.append(post_id)
+        self._doc_lengths.append(len(terms))
+        self._current_doc[post_id] = doc
+        self._total_length += len(terms)
+        for term, tf in Counter(terms).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = bytearray()
+            _encode_varint(doc - self._last_doc.get(term, 0), postings)
+            _encode_varint(tf, postings)
+            self._last_doc[term] = doc
+            self._doc_freq[term] += 1
+
+    def remove_post(self, post_id: int, text: str) -> None:
+        """Retire the indexed version of post_id (text is what was indexed)."""
+        doc = self._current_doc.pop(post_id, None)
+        if doc is None:
+            return
+        self._doc_post_ids[doc] = -1
+        self._total_length -= self._doc_lengths[doc]
+        for term in set(_tokenize(text)):
+            self._doc_freq[term] -= 1
+            if not self._doc_freq[term]:
+                del self._doc_freq[term]
+        if len(self._doc_post_ids) - len(self._current_doc) > max(1024, len(self._current_doc)):
+            self.compact()
+
+    def update_post(self, post_id: int, old_text: str, new_text: str) -> None:
+        """Re-index post_id after its content changed."""
+        self.remove_post(post_id, old_text)
+        self.add_post(post_id, new_text)
+
+    def compact(self) -> None:
+        """Drop retired docs and renumber the live ones densely."""
+        renumber = {}
+        post_ids = array('q')
+        lengths = array('I')
+        for doc, post_id in enumerate(self._doc_post_ids):
+            if post_id >= 0:
+                renumber[doc] = len(post_ids)
+                post_ids.append(post_id)
+                lengths.append(self._doc_lengths[doc])
+        postings, last_doc = {}, {}
+        for term, data in self._postings.items():
+            rebuilt, previous = bytearray(), 0
+            for doc, tf in self._iter_postings(data):
+                new_doc = renumber.get(doc)
+                if new_doc is not None:
+                    _encode_varint(new_doc - previous, rebuilt)
+                    _encode_varint(tf, rebuilt)
+                    previous = new_doc
+            if rebuilt:
+                postings[term] = rebuilt
+                last_doc[term] = previous
+        self._postings, self._last_doc = postings, last_doc
+        self._doc_post_ids, self._doc_lengths = post_ids, lengths
+        self._current_doc = {post_id: doc for doc, post_id in enumerate(post_ids)}
+
+    @staticmethod
+    def _iter_postings(data: bytearray) -> Iterator[tuple[int, int]]:
+        """Yield (doc number, term frequency) pairs from a posting list."""
+        values = _decode_varints(data)
+        doc = 0
+        for delta in values:
+            doc += delta
+            yield doc, next(values)
+
+    def search(self, query: str, limit: int = 10,
+               accept: Optional[Callable[[int], bool]] = None) -> list[tuple[int, float]]:
+        """
+        Return up to limit (post_id, score) pairs, best BM25 score first.
+
+        accept(post_id) can reject candidates (e.g. private posts) before
+        they are ranked.
+        """
+        live = len(self._current_doc)
+        if not live or limit <= 0:
+            return []
+        avg_length = self._total_length / live or 1.0
+        scores = {}
+        for term in set(_tokenize(query)):
+            df = self._doc_freq.get(term)
+            if not df:
+                continue
+            idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+            for doc, tf in self._iter_postings(self._postings[term]):
+                if self._doc_post_ids[doc] < 0:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc] / avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = ((score, self._doc_post_ids[doc]) for doc, score in scores.items())
+        if accept is not None:
+            ranked = ((score, post_id) for score, post_id in ranked if accept(post_id))
+        return [(post_id, score) for score, post_id in heapq.nlargest(limit, ranked)]
+
+
+class RenderCache:
+    """
+    Size-limited LRU cache for rendered post text.
+
+    Keys are (post_id, version, kind). A post bumps its version on every
+    mutation, so stale renders are never served and simply age out of the
+    LRU order.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_render(self, key: tuple, render: Callable[[], str]) -> str:
+        """Return the cached text for key, rendering and storing it on a miss."""
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = self._entries[key] = render()
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return text
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (0.0 before any lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self) -> str:
+        """Return a one-line summary of cache effectiveness."""
+        return (f"Render cache: {len(self._entries)}/{self.max_entries} entries | "
+                f"Hits: {self.hits} | Misses: {self.misses} | "
+                f"Evictions: {self.evictions} | Hit rate: {self.hit_rate:.1%}")
+
+    def discard(self, key: tuple) -> None:
+        """Drop key's entry, if cached."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+def _simhash(text: str, bits: int = 64) -> int:
+    """
+    SimHash fingerprint of text over word bigrams.
+
+    Similar texts produce fingerprints that differ in only a few bits, so
+    Hamming distance approximates how different two posts are. Text with
+    no words (emoji or punctuation only) is shingled into character
+    bigrams instead, so such posts don't all share one fingerprint.
+    """
+    terms = _tokenize(text)
+    if terms:
+        shingles = [" ".join(terms[i:i + 2]) for i in range(max(1, len(terms) - 1))]
+    else:
+        chars = "".join(text.split())
+        shingles = [chars[i:i + 2] for i in range(max(1, len(chars) - 1))]
+    weights = [0] * bits
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode(), digest_size=bits // 8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class NearDuplicateDetector:
+    """
+    Locality-sensitive index of post fingerprints for spotting spam waves.
+
+    The 64-bit SimHash is split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits must agree exactly on at least one band, so only
+    posts sharing a band bucket are compared. Each bucket keeps its most
+    recent max_candidates entries, which bounds the work per new post even
+    when thousands of copies land in the same bucket. Matches are merged into
+    clusters with union-find.
+    """
+
+    BITS = 64
+
+    def __init__(self, max_distance: int = 3, max_candidates: int = 32):
+        if not 0 <= max_distance < 16:
+            raise ValueError("max_distance must be between 0 and 15.")
+        self.max_distance = max_distance
+        self.max_candidates = max_candidates
+        self._bands = max_distance + 1
+        self._band_width = self.BITS // self._bands
+        self._buckets = {}                # (band, band value) -> recent post_ids
+        self._fingerprints = {}           # post_id -> SimHash
+        self._parent = {}                 # union-find parent pointers
+        self._cluster_sizes = {}          # cluster root -> number of posts
+
+    def _band_keys(self, fingerprint: int) -> Iterator[tuple[int, int]]:
+        mask = (1 << self._band_width) - 1
+        for band in range(self._bands):
+            yield band, fingerprint >> (band * self._band_width) & mask
+
+    def _find(self, post_id: int) -> int:
+        root = post_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[post_id] != root:
+            self._parent[post_id], post_id = root, self._parent[post_id]
+        return root
+
+    def add(self, post_id: int, text: str) -> Optional[int]:
+        """
+        Fingerprint and index a new post.
+
+        Returns the post_id of an earlier near-duplicate, or None if the
+        post looks original. Blank text has nothing to compare, so it is
+        never matched.
+        """
+        self._parent[post_id] = post_id
+        self._cluster_sizes[post_id] = 1
+        if not text.strip():
+            return None
+        fingerprint = self._fingerprints[post_id] = _simhash(text, self.BITS)
+        match = None
+        for key in self._band_keys(fingerprint):
+            bucket = self._buckets.setdefault(key, [])
+            for other in bucket:
+                if bin(fingerprint ^ self._fingerprints[other]).count("1") <= self.max_distance:
+                    match = other if match is None else min(match, other)
+                    self._union(post_id, other)
+            bucket.append(post_id)
+            if len(bucket) > self.max_candidates:
+                del bucket[0]
+        return match
+
+    def remove(self, post_id: int) -> None:
+        """
+        Stop matching new posts against post_id (e.g. it was deleted).
+
+        The ID stays in the union-find as a path node, so clusters that
+        went through it stay merged; it just no longer counts toward them.
+        """
+        fingerprint = self._fingerprints.pop(post_id, None)
+        if fingerprint is None:
+            return
+        for key in self._band_keys(fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket and post_id in bucket:
+                bucket.remove(post_id)
+                if not bucket:
+                    del self._buckets[key]
+        root = self._find(post_id)
+        self._cluster_sizes[root] -= 1
+        if not self._cluster_sizes[root]:
+            del self._cluster_sizes[root]
+
+    def _union(self, post_id: int, other: int) -> None:
+        root, other_root = self._find(post_id), self._find(other)
+        if root != other_root:
+            if root < other_root:
+                root, other_root = other_root, root
+            self._parent[root] = other_root
+            self._cluster_sizes[other_root] += self._cluster_sizes.pop(root)
+
+    def cluster_size(self, post_id: int) -> int:
+        """Number of posts in the same near-duplicate cluster as post_id."""
+        return self._cluster_sizes[self._find(post_id)]
+
+    def cluster_sizes(self, min_size: int = 2) -> dict[int, int]:
+        """Map each cluster's oldest post_id to its size, for clusters >= min_size."""
+        return {root: size for root, size in self._cluster_sizes.items() if size >= min_size}
+
+    @staticmethod
+    def tune_max_distance(labeled_pairs: list[tuple[str, str, bool]],
+                          candidates: range = range(16)) -> tuple[int, float]:
+        """
+        Pick the max_distance with the best F1 score on labeled text pairs.
+
+        labeled_pairs holds (text_a, text_b, is_duplicate) tuples, e.g. a
+        hand-labeled sample of a past spam wave. Returns (max_distance, f1).
+        """
+        distances = [(bin(_simhash(a) ^ _simhash(b)).count("1"), is_duplicate)
+                     for a, b, is_duplicate in labeled_pairs]
+        best = (candidates[0], 0.0)
+        for threshold in candidates:
+            tp = sum(1 for d, dup in distances if dup and d <= threshold)
+            fp = sum(1 for d, dup in distances if not dup and d <= threshold)
+            fn = sum(1 for d, dup in distances if dup and d > threshold)
+            f1 = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+            if f1 > best[1]:
+                best = (threshold, f1)
+        return best
+
+
+class TokenBucketLimiter:
+    """
+    In-process per-key token buckets (e.g. one bucket per author).
+
+    Each key may spend `capacity` actions in a burst, refilled at `rate`
+    tokens per second. Bucket state lives in two flat float arrays indexed by
+    a slot number, so a key costs one dict entry plus 16 bytes. A bucket idle
+    long enough to refill completely behaves exactly like a new one, so every
+    check also sweeps a couple of slots and frees the idle ones - eviction is
+    lazy, amortized O(1) and never changes a decision.
+    """
+
+    def __init__(self, rate: float, capacity: float, sweep_batch: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self.idle_seconds = capacity / rate   # time to refill an empty bucket
+        self.sweep_batch = sweep_batch
+        self._clock = clock
+        self._slots = {}                  # key -> slot number
+        self._keys = []                   # slot number -> key (None if free)
+        self._tokens = array('d')
+        self._updated = array('d')
+        self._free_slots = []
+        self._sweep_cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def allow(self, key: str, cost: float = 1.0) -> bool:
+        """Spend cost tokens from key's bucket; False if it doesn't have them."""
+        now = self._clock()
+        self._sweep(now)
+        slot = self._slots.get(key)
+        if slot is None:
+            if cost > self.capacity:
+                return False
+            slot = self._free_slots.pop() if self._free_slots else self._new_slot()
+            self._slots[key] = slot
+            self._keys[slot] = key
+            self._tokens[slot] = self.capacity - cost
+            self._updated[slot] = now
+            return True
+        tokens = min(self.capacity,
+                     self._tokens[slot] + (now - self._updated[slot]) * self.rate)
+        self._updated[slot] = now
+        if tokens < cost:
+            self._tokens[slot] = tokens
+            return False
+        self._tokens[slot] = tokens - cost
+        return True
+
+    def _new_slot(self) -> int:
+        self._keys.append(None)
+        self._tokens.append(0.0)
+        self._updated.append(0.0)
+        return len(self._keys) - 1
+
+    def _sweep(self, now: float) -> None:
+        """Free up to sweep_batch slots whose buckets have fully refilled."""
+        if not self._keys:
+            return
+        for _ in range(min(self.sweep_batch, len(self._keys))):
+            slot = self._sweep_cursor = (self._sweep_cursor + 1) % len(self._keys)
+            key = self._keys[slot]
+            if key is not None and now - self._updated[slot] >= self.idle_seconds:
+                del self._slots[key]
+                self._keys[slot] = None
+                self._free_slots.append(slot)
+
+
+class TimePartitionedStore:
+    """
+    Post IDs bucketed into fixed time partitions (hourly by default).
+
+    Each partition holds two parallel int arrays - creation epochs and post
+    IDs - kept in time order. A range query walks only the partitions that
+    overlap the range and bisects the two at its edges; dropping old data
+    deletes whole partitions without touching newer ones.
+    """
+
+    def __init__(self, partition_seconds: int = 3600):
+        if partition_seconds <= 0:
+            raise ValueError("partition_seconds must be positive.")
+        self.partition_seconds = partition_seconds
+        self._partitions = {}             # partition start -> (epochs, post_ids)
+        self._starts = []                 # sorted partition starts
+
+    def __len__(self) -> int:
+        return sum(len(post_ids) for _, post_ids in self._partitions.values())
+
+    def add(self, post_id: int, created_at: int) -> None:
+        """Record post_id as created at the given epoch second."""
+        start = created_at - created_at % self.partition_seconds
+        partition = self._partitions.get(start)
+        if partition is None:
+            partition = self._partitions[start] = (array('q'), array('q'))
+            bisect.insort(self._starts, start)
+        epochs, post_ids = partition
+        if not epochs or epochs[-1] <= created_at:
+            epochs.append(created_at)
+            post_ids.append(post_id)
+        else:  # clock stepped backwards: keep the partition sorted
+            index = bisect.bisect_right(epochs, created_at)
+            epochs.insert(index, created_at)
+            post_ids.insert(index, post_id)
+
+    def remove(self, post_id: int, created_at: int) -> None:
+        """Forget post_id (a no-op if its partition was already dropped)."""
+        start = created_at - created_at % self.partition_seconds
+        partition = self._partitions.get(start)
+        if partition is None:
+            return
+        epochs, post_ids = partition
+        # Only the entries sharing post_id's epoch need checking.
+        for index in range(bisect.bisect_left(epochs, created_at), bisect.bisect_right(epochs, created_at)):
+            if post_ids[index] == post_id:
+                del epochs[index]
+                del post_ids[index]
+                return
+
+    def query(self, start_time: int, end_time: int) -> Iterator[int]:
+        """Yield post IDs created in [start_time, end_time), oldest first."""
+        first = bisect.bisect_right(self._starts, start_time - self.partition_seconds)
+        last = bisect.bisect_left(self._starts, end_time)
+        for start in self._starts[first:last]:
+            epochs, post_ids = self._partitions[start]
+            low = 0 if start >= start_time else bisect.bisect_left(epochs, start_time)
+            high = (len(epochs) if start + self.partition_seconds <= end_time
+                    else bisect.bisect_left(epochs, end_time))
+            yield from post_ids[low:high]
+
+    def drop_before(self, cutoff: int) -> list[int]:
+        """Drop every partition that ends at or before cutoff; return its post IDs."""
+        count = bisect.bisect_right(self._starts, cutoff - self.partition_seconds)
+        dropped = []
+        for start in self._starts[:count]:
+            dropped.extend(self._partitions.pop(start)[1])
+        del self._starts[:count]
+        return dropped
+
+
+class PNCounter:
+    """
+    Conflict-free counter: one increment and one decrement total per node.
+
+    A node only ever raises its own totals, so replicas merge by taking the
+    per-node maximum - in any order, any number of times.
+    """
+
+    def __init__(self):
+        self._increments = {}             # node_id -> total increments
+        self._decrements = {}             # node_id -> total decrements
+
+    @property
+    def value(self) -> int:
+        return sum(self._increments.values()) - sum(self._decrements.values())
+
+    def increment(self, node_id: str, amount: int = 1) -> None:
+        self._increments[node_id] = self._increments.get(node_id, 0) + amount
+
+    def decrement(self, node_id: str, amount: int = 1) -> None:
+        self._decrements[node_id] = self._decrements.get(node_id, 0) + amount
+
+    def merge(self, other: "PNCounter") -> None:
+        for mine, theirs in ((self._increments, other._increments),
+                             (self._decrements, other._decrements)):
+            for node_id, total in theirs.items():
+                if total > mine.get(node_id, 0):
+                    mine[node_id] = total
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, PNCounter) and self._increments == other._increments
+                and self._decrements == other._decrements)
+
+
+class GSet:
+    """Grow-only set: elements can be added but never removed; merge is union."""
+
+    def __init__(self):
+        self._items = set()
+
+    def add(self, item) -> bool:
+        """Add item; return False if it was already present."""
+        if item in self._items:
+            return False
+        self._items.add(item)
+        return True
+
+    def merge(self, other: "GSet") -> None:
+        self._items |= other._items
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, GSet) and self._items == other._items
+
+
+class EngagementReplica:
+    """
+    One node's copy of a post's likes and comments.
+
+    Likes sent without an idempotency key go to a PNCounter. Keyed likes
+    and unlikes are stored as their keys in grow-only sets, so one
+    operation retried on two nodes becomes a single element once the
+    replicas merge and is counted once. Comments are a GSet of
+    (comment_id, text) pairs; a keyed comment uses its key as the
+    comment_id, so a retry collapses to one comment wherever it lands.
+    Each comment's creation time is kept beside the set (merged by taking
+    the earliest) and only used for ordering. Replicas on different
+    processes converge by merging each other's state with no coordinator.
+    """
+
+    def __init__(self, node_id: str):
+        self.node_id = node_id
+        self.likes = PNCounter()          # likes/unlikes sent without a key
+        self.liked_keys = GSet()
+        self.unliked_keys = GSet()
+        self.comments = GSet()            # (comment_id, text)
+        self._comment_times = {}          # (comment_id, text) -> earliest created_ns
+        self._next_comment = 0
+        self._ordered_comments = None     # sorted comments, rebuilt after changes
+
+    @property
+    def net_likes(self) -> int:
+        """Likes minus unlikes over every merged replica (may dip below 0)."""
+        return self.likes.value + len(self.liked_keys) - len(self.unliked_keys)
+
+    @property
+    def likes_count(self) -> int:
+        # Concurrent unlikes on two nodes can overshoot; never show < 0.
+        return max(0, self.net_likes)
+
+    def like(self, key: Optional[str] = None) -> bool:
+        if key is not None:
+            return self.liked_keys.add(key)
+        self.likes.increment(self.node_id)
+        return True
+
+    def unlike(self, key: Optional[str] = None) -> bool:
+        if not self.likes_count:
+            return False
+        if key is not None:
+            return self.unliked_keys.add(key)
+        self.likes.decrement(self.node_id)
+        return True
+
+    def add_comment(self, text: str, key: Optional[str] = None) -> bool:
+        if key is None:
+            key = f"{self.node_id}:{self._next_comment}"
+            self._next_comment += 1
+        comment = (key, text)
+        if not self.comments.add(comment):
+            return False
+        self._comment_times[comment] = time.time_ns()
+        self._ordered_comments = None
+        return True
+
+    def ordered_comments(self) -> list[str]:
+        """Comment texts, oldest first (ties broken by comment_id)."""
+        if self._ordered_comments is None:
+            times = self._comment_times
+            self._ordered_comments = [text for _, text in
+                                      sorted(self.comments, key=lambda comment: (times[comment], comment))]
+        return self._ordered_comments
+
+    def merge(self, other: "EngagementReplica") -> None:
+        """Fold another replica's state into this one."""
+        self.likes.merge(other.likes)
+        self.liked_keys.merge(other.liked_keys)
+        self.unliked_keys.merge(other.unliked_keys)
+        self.comments.merge(other.comments)
+        for comment, created in other._comment_times.items():
+            if created < self._comment_times.get(comment, created + 1):
+                self._comment_times[comment] = created
+        self._ordered_comments = None
+
+    def snapshot(self) -> "EngagementReplica":
+        """Independent copy of this replica's state, e.g. to gossip to a peer."""
+        snapshot = EngagementReplica(self.node_id)
+        snapshot.merge(self)
+        return snapshot
+
+    def same_state(self, other: "EngagementReplica") -> bool:
+        return (self.likes == other.likes and self.liked_keys == other.liked_keys
+                and self.unliked_keys == other.unliked_keys and self.comments == other.comments
+                and self._comment_times == other._comment_times)
+
+
+class HotPostLeaderboard:
+    """
+    Top posts by time-decayed engagement, updated one event at a time.
+
+    A post's hotness at time `now` is the sum over its events of
+    weight * 2 ** (-(now - event_time) / half_life). Every post decays by the
+    same factor, so ranking by log(sum(weight * e ** (event_time / tau)))
+    gives the same order at any `now`. That log-space score only grows with
+    each event (via log-add-exp) and never needs a periodic rewrite.
+    Because scores only grow, the sorted top list only changes when a post
+    climbs into or within it; a full rebuild happens only when a top post is
+    hidden.
+    """
+
+    POST, LIKE, COMMENT = "post", "like", "comment"
+
+    def __init__(self, half_life_hours: float = 12.0, size: int = 100,
+                 weights: Optional[dict[str, float]] = None):
+        self.tau = half_life_hours * 3600 / math.log(2)
+        self.size = size
+        self.weights = weights or {self.POST: 1.0, self.LIKE: 1.0, self.COMMENT: 2.0}
+        self._log_scores = {}             # post_id -> log-space score
+        self._hidden = set()              # posts kept out of the ranking
+        self._top = []                    # [(-score, post_id)], best first
+        self._in_top = set()
+
+    def record(self, post_id: int, event: str, when: Optional[float] = None) -> None:
+        """Add one post/like/comment event for post_id."""
+        when = time.time() if when is None else when
+        term = math.log(self.weights[event]) + when / self.tau
+        old = self._log_scores.get(post_id)
+        if old is None:
+            new = term
+        else:
+            high, low = (old, term) if old > term else (term, old)
+            new = high + math.log1p(math.exp(low - high))
+        self._log_scores[post_id] = new
+        if post_id in self._hidden:
+            return
+        if post_id in self._in_top:
+            del self._top[bisect.bisect_left(self._top, (-old, post_id))]
+            bisect.insort(self._top, (-new, post_id))
+        elif len(self._top) < self.size or -new < self._top[-1][0]:
+            bisect.insort(self._top, (-new, post_id))
+            self._in_top.add(post_id)
+            if len(self._top) > self.size:
+                self._in_top.discard(self._top.pop()[1])
+
+    def hide(self, post_id: int) -> None:
+        """Exclude post_id from the ranking (its score keeps accumulating)."""
+        self._hidden.add(post_id)
+        if post_id in self._in_top:
+            self._rebuild()
+
+    def show(self, post_id: int) -> None:
+        """Put a hidden post back into the ranking."""
+        self._hidden.discard(post_id)
+        score = self._log_scores.get(post_id)
+        if score is not None and (len(self._top) < self.size or -score < self._top[-1][0]):
+            self._rebuild()
+
+    def forget(self, post_id: int) -> None:
+        """Drop post_id entirely (e.g. the post was deleted)."""
+        self.hide(post_id)
+        self._hidden.discard(post_id)
+        self._log_scores.pop(post_id, None)
+
+    def _rebuild(self) -> None:
+        visible = ((-score, post_id) for post_id, score in self._log_scores.items()
+                   if post_id not in self._hidden)
+        self._top = heapq.nsmallest(self.size, visible)
+        self._in_top = {post_id for _, post_id in self._top}
+
+    def top(self, limit: Optional[int] = None) -> list[int]:
+        """Return the hottest post IDs, hottest first (at most `size`)."""
+        return [post_id for _, post_id in self._top[:limit]]
+
+    def hotness(self, post_id: int, now: Optional[float] = None) -> float:
+        """Decayed engagement of post_id as of now (0.0 if unknown)."""
+        score = self._log_scores.get(post_id)
+        if score is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return math.exp(score - now / self.tau)
+
+
+class PostBitmap:
+    """
+    Set of post IDs split into 65,536-ID chunks, each stored compactly.
+
+    Like a Roaring bitmap, a chunk holding at most ARRAY_MAX IDs is a sorted
+    array of their low 16 bits (2 bytes per post), and a denser chunk is a
+    Python int used as a bitset (8 KB at most). Empty chunks are not
+    stored, so an author with a handful of posts spread over years of IDs
+    costs a few bytes per post instead of a mostly-zero bitset per chunk.
+    Intersections, unions and range filters work chunk by chunk: two
+    arrays are merged as sets, anything involving a bitset is done on
+    whole ints.
+    """
+
+    CHUNK_BITS = 16
+    CHUNK_MASK = (1 << CHUNK_BITS) - 1
+    ARRAY_MAX = 4096                      # 4,096 two-byte entries = one 8 KB bitset
+
+    def __init__(self, post_ids=()):
+        self._chunks = {}                 # chunk number -> array('H') of low bits, or int bitset
+        for post_id in post_ids:
+            self.add(post_id)
+
+    @classmethod
+    def _compact(cls, container):
+        """Return container in its smaller form, or None if it is empty."""
+        if isinstance(container, int):
+            count = container.bit_count()
+            if count > cls.ARRAY_MAX:
+                return container
+            if not count:
+                return None
+            return array('H', cls._bit_positions(container))
+        if len(container) > cls.ARRAY_MAX:
+            return cls._as_bits(container)
+        return container or None
+
+    @staticmethod
+    def _bit_positions(bits: int) -> Iterator[int]:
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    @staticmethod
+    def _as_bits(container) -> int:
+        if isinstance(container, int):
+            return container
+        bits = 0
+        for low in container:
+            bits |= 1 << low
+        return bits
+
+    def add(self, post_id: int) -> None:
+        chunk, low = post_id >> self.CHUNK_BITS, post_id & self.CHUNK_MASK
+        container = self._chunks.get(chunk)
+        if container is None:
+            self._chunks[chunk] = array('H', (low,))
+        elif isinstance(container, int):
+            self._chunks[chunk] = container | 1 << low
+        else:
+            position = bisect.bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                container.insert(position, low)
+                if len(container) > self.ARRAY_MAX:
+                    self._chunks[chunk] = self._as_bits(container)
+
+    def discard(self, post_id: int) -> None:
+        chunk, low = post_id >> self.CHUNK_BITS, post_id & self.CHUNK_MASK
+        container = self._chunks.get(chunk)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container = self._compact(container & ~(1 << low))
+        else:
+            position = bisect.bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                del container[position]
+            container = container or None
+        if container is None:
+            del self._chunks[chunk]
+        else:
+            self._chunks[chunk] = container
+
+    def __contains__(self, post_id: int) -> bool:
+        container = self._chunks.get(post_id >> self.CHUNK_BITS)
+        if container is None:
+            return False
+        low = post_id & self.CHUNK_MASK
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        position = bisect.bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self) -> int:
+        return sum(container.bit_count() if isinstance(container, int) else len(container)
+                   for container in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield post IDs in ascending order."""
+        for chunk in sorted(self._chunks):
+            container, base = self._chunks[chunk], chunk << self.CHUNK_BITS
+            lows = self._bit_positions(container) if isinstance(container, int) else container
+            for low in lows:
+                yield base + low
+
+    def __and__(self, other: "PostBitmap") -> "PostBitmap":
+        result = PostBitmap()
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        for chunk, container in small.items():
+            match = large.get(chunk)
+            if match is None:
+                continue
+            if isinstance(container, int) or isinstance(match, int):
+                common = self._compact(self._as_bits(container) & self._as_bits(match))
+            else:
+                common = array('H', sorted(set(container).intersection(match))) or None
+            if common is not None:
+                result._chunks[chunk] = common
+        return result
+
+    def __or__(self, other: "PostBitmap") -> "PostBitmap":
+        result = PostBitmap()
+        for chunk, container in self._chunks.items():
+            result._chunks[chunk] = container if isinstance(container, int) else array('H', container)
+        for chunk, container in other._chunks.items():
+            mine = result._chunks.get(chunk)
+            if mine is None:
+                merged = container if isinstance(container, int) else array('H', container)
+            elif isinstance(mine, int) or isinstance(container, int):
+                merged = self._as_bits(mine) | self._as_bits(container)
+            else:
+                merged = self._compact(array('H', sorted(set(mine).union(container))))
+            result._chunks[chunk] = merged
+        return result
+
+    def in_range(self, low: int, high: int) -> "PostBitmap":
+        """Return the IDs in [low, high) as a new bitmap."""
+        result = PostBitmap()
+        for chunk, container in self._chunks.items():
+            base = chunk << self.CHUNK_BITS
+            if base + self.CHUNK_MASK < low or base >= high:
+                continue
+            start, stop = max(0, low - base), min(self.CHUNK_MASK + 1, high - base)
+            if isinstance(container, int):
+                kept = self._compact(container & ((1 << stop) - 1) & (-1 << start))
+            else:
+                kept = container[bisect.bisect_left(container, start):bisect.bisect_left(container, stop)] or None
+            if kept is not None:
+                result._chunks[chunk] = kept
+        return result
+
+
+class VisibilityIndex:
+    """
+    Public-post bitmap plus one bitmap of post IDs per author.
+
+    Kept current by post creation and make_private()/make_public(), so
+    listings like "public posts by author X" are a single bitmap
+    intersection instead of a scan over post objects.
+    """
+
+    def __init__(self):
+        self.public = PostBitmap()
+        self.by_author = {}               # author -> PostBitmap
+
+    def add(self, post_id: int, author: str, is_public: bool) -> None:
+        self.by_author.setdefault(author, PostBitmap()).add(post_id)
+        self.set_public(post_id, is_public)
+
+    def remove(self, post_id: int, author: str) -> None:
+        self.public.discard(post_id)
+        posts = self.by_author.get(author)
+        if posts is not None:
+            posts.discard(post_id)
+            if not posts:
+                del self.by_author[author]
+
+    def set_public(self, post_id: int, is_public: bool) -> None:
+        if is_public:
+            self.public.add(post_id)
+        else:
+            self.public.discard(post_id)
+
+    def public_by_author(self, author: str) -> PostBitmap:
+        return self.public & self.by_author.get(author, PostBitmap())
+
+    def public_in_range(self, low: int, high: int) -> PostBitmap:
+        """Public post IDs in [low, high); IDs grow with creation time."""
+        return self.public.in_range(low, high)
+
+
+class _HashtagTrieNode:
+    __slots__ = ("children", "top", "tags")
+
+    def __init__(self, tags=None):
+        self.children = {}                # next character -> node
+        self.top = []                     # [(-uses, tag)], most used first
+        self.tags = tags                  # tags stored at this node (see below)
+
+
+class HashtagAutocomplete:
+    """
+    Burst trie over hashtags with the top-k completions stored at each node.
+
+    A suggestion is one walk down the prefix followed by reading a
+    precomputed list, so lookups don't depend on how many tags exist.
+    Recording a use just moves that tag up in the lists along its path;
+    forgetting one rebuilds only the lists it was in, bottom-up, from the
+    children's lists. A leaf keeps the full set of tags under its prefix
+    and only bursts into child nodes once it holds more than bucket_size
+    tags (never past max_depth characters), so the long unique tails of
+    rare tags cost one set entry instead of a node per character. A prefix
+    that ends inside a leaf is answered exactly by filtering its set.
+
+    Memory budget: 170-340 bytes per distinct tag for the trie nodes, top-k
+    lists, leaf sets and use-count dict (measured at 1M and 3M random tags;
+    it depends on how full the leaves are), not counting the tag strings.
+    Plan for about 3.5 GB at 10M tags - see benchmark_hashtag_autocomplete().
+    """
+
+    def __init__(self, k: int = 10, max_depth: int = 16, bucket_size: int = 32):
+        self.k = k
+        self.max_depth = max_depth
+        self.bucket_size = bucket_size
+        self._root = _HashtagTrieNode()
+        self._uses = {}                   # tag -> number of posts using it
+
+    def __len__(self) -> int:
+        return len(self._uses)
+
+    def _path(self, tag: str) -> list[_HashtagTrieNode]:
+        """Nodes from the root down to the one that stores tag, creating them as needed."""
+        path = [self._root]
+        node = self._root
+        for char in tag:
+            if not node.children:
+                break                     # a leaf stores its whole subtree
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _HashtagTrieNode()
+            path.append(child)
+            node = child
+        return path
+
+    def record(self, tag: str) -> None:
+        """Count one more post using tag (e.g. "#python")."""
+        old = self._uses.get(tag, 0)
+        self._uses[tag] = new = old + 1
+        path = self._path(tag)
+        for node in path[1:]:
+            top = node.top
+            if old and (-old, tag) in top:
+                top.remove((-old, tag))
+            elif len(top) >= self.k and (-new, tag) > top[-1]:
+                continue
+            bisect.insort(top, (-new, tag))
+            del top[self.k:]
+        if not old:
+            node = path[-1]
+            if node.tags is None:
+                node.tags = set()
+            node.tags.add(tag)
+            if not node.children and len(node.tags) > self.bucket_size:
+                self._burst(node, len(path) - 1)
+
+    def _burst(self, node: _HashtagTrieNode, depth: int) -> None:
+        """Move a leaf's longer tags into one child leaf per next character."""
+        if depth >= self.max_depth:
+            return
+        kept, moved = set(), {}
+        for tag in node.tags:
+            if len(tag) > depth:
+                moved.setdefault(tag[depth], set()).add(tag)
+            else:
+                kept.add(tag)
+        node.tags = kept or None
+        for char, tags in moved.items():
+            child = node.children[char] = _HashtagTrieNode(tags)
+            child.top = heapq.nsmallest(self.k, ((-self._uses[tag], tag) for tag in tags))
+            if len(tags) > self.bucket_size:
+                self._burst(child, depth + 1)
+
+    def forget(self, tag: str) -> None:
+        """Count one fewer post using tag (e.g. the post was deleted)."""
+        old = self._uses.get(tag)
+        if old is None:
+            return
+        if old > 1:
+            self._uses[tag] = old - 1
+        else:
+            del self._uses[tag]
+        path = self._path(tag)
+        if old == 1:
+            path[-1].tags.discard(tag)
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if (-old, tag) not in node.top:
+                break                     # ancestors' lists can't contain it either
+            self._rebuild(node)
+            if not node.top:
+                del path[depth - 1].children[tag[depth - 1]]
+
+    def _rebuild(self, node: _HashtagTrieNode) -> None:
+        """Recompute node.top from its own tags and its children's lists."""
+        candidates = [entry for child in node.children.values() for entry in child.top]
+        if node.tags:
+            candidates.extend((-self._uses[tag], tag) for tag in node.tags)
+        node.top = heapq.nsmallest(self.k, candidates)
+
+    def suggest(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """Return up to limit popular tags starting with prefix, most used first."""
+        prefix = prefix.lower()
+        if not prefix.startswith("#"):
+            prefix = "#" + prefix
+        node = self._root
+        for char in prefix:
+            if not node.children:
+                break
+            node = node.children.get(char)
+            if node is None:
+                return []
+        else:
+            return [tag for _, tag in node.top][:limit]
+        matches = ((-self._uses[tag], tag) for tag in node.tags or () if tag.startswith(prefix))
+        return [tag for _, tag in heapq.nsmallest(self.k if limit is None else min(self.k, limit), matches)]
+
+
+class PostArchive:
+    """
+    Cold storage for rarely read post state, as zlib-compressed blocks on disk.
+
+    Each archive() call writes one block file holding many posts' state.
+    Restoring a post decompresses its block once (recent blocks stay in a
+    small LRU) and deletes the file when every post in it has come back.
+    Block files are only meaningful to this process, so close() - run at
+    exit if not called earlier - deletes the ones left, along with the
+    directory if the archive created it.
+    """
+
+    def __init__(self, directory: Optional[str] = None, cached_blocks: int = 4):
+        self._directory = directory
+        self._owns_directory = False
+        self._cached_blocks = cached_blocks
+        self._next_block = 0
+        self._pending = {}                # block_id -> post_ids not yet restored
+        self._block_cache = OrderedDict() # block_id -> decompressed states
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="post-archive-")
+            self._owns_directory = True
+            atexit.register(self.close)
+        return self._directory
+
+    def close(self) -> None:
+        """Delete every remaining block file; archived posts can't be restored afterwards."""
+        if self._owns_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory, self._owns_directory = None, False
+            atexit.unregister(self.close)
+        elif self._directory is not None:
+            for block_id in self._pending:
+                try:
+                    os.remove(self._path(block_id))
+                except FileNotFoundError:
+                    pass
+        self._pending.clear()
+        self._block_cache.clear()
+
+    def _path(self, block_id: int) -> str:
+        return os.path.join(self.directory, f"block-{block_id:06d}.zlib")
+
+    def archive(self, states: dict[int, dict]) -> int:
+        """Write post_id -> state to a new block and return its block_id."""
+        block_id = self._next_block
+        self._next_block += 1
+        with open(self._path(block_id), "wb") as block_file:
+            block_file.write(zlib.compress(pickle.dumps(states, pickle.HIGHEST_PROTOCOL)))
+        self._pending[block_id] = set(states)
+        return block_id
+
+    def restore(self, block_id: int, post_id: int) -> dict:
+        """Return (and forget) the archived state of post_id."""
+        states = self._block_cache.get(block_id)
+        if states is None:
+            with open(self._path(block_id), "rb") as block_file:
+                states = pickle.loads(zlib.decompress(block_file.read()))
+            self._block_cache[block_id] = states
+            if len(self._block_cache) > self._cached_blocks:
+                self._block_cache.popitem(last=False)
+        else:
+            self._block_cache.move_to_end(block_id)
+        pending = self._pending[block_id]
+        pending.discard(post_id)
+        if not pending:
+            del self._pending[block_id]
+            self._block_cache.pop(block_id, None)
+            os.remove(self._path(block_id))
+        return states[post_id]
+
+    def scan(self) -> Iterator[tuple[int, dict]]:
+        """Yield (post_id, state) for every archived post, leaving it archived."""
+        for block_id, post_ids in list(self._pending.items()):
+            states = self._block_cache.get(block_id)
+            if states is None:            # read-only pass: don't churn the LRU
+                with open(self._path(block_id), "rb") as block_file:
+                    states = pickle.loads(zlib.decompress(block_file.read()))
+            for post_id in post_ids:
+                yield post_id, states[post_id]
+
+    def archived_count(self) -> int:
+        return sum(len(post_ids) for post_ids in self._pending.values())
+
+
+class ModerationFilter:
+    """
+    Banned-phrase matcher compiled into an Aho-Corasick automaton.
+
+    All phrases are matched in one left-to-right pass over the text,
+    however many phrases there are, instead of one `in` check per phrase.
+    Matching is case-insensitive and substring-based, like `phrase in text`.
+    """
+
+    def __init__(self, phrases=()):
+        self.phrases = sorted({phrase.lower() for phrase in phrases if phrase})
+        self._goto = [{}]                 # state -> {char: next state}
+        self._fail = [0]
+        self._output = [()]               # state -> phrases ending here
+        for phrase in self.phrases:
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (phrase,)
+        # Breadth-first: a state's failure link points to the longest proper
+        # suffix of its path that is also a path in the trie.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0) if state else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def __bool__(self) -> bool:
+        return bool(self.phrases)
+
+    def find(self, text: str, first_only: bool = False) -> list[str]:
+        """Return the banned phrases found in text (in order of first match)."""
+        found = {}
+        if not self.phrases:
+            return []
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(dict.fromkeys(output[state]))
+                if first_only:
+                    break
+        return list(found)
+
+
+# Each batch worker compiles the phrase list once, when its process starts
+_worker_moderation_filter = ModerationFilter()
+
+
+def _init_moderation_worker(phrases: list[str]) -> None:
+    global _worker_moderation_filter
+    _worker_moderation_filter = ModerationFilter(phrases)
+
+
+def _scan_post_batch(batch: list[tuple[int, list[str]]]) -> list[tuple[int, list[str]]]:
+    """Return (post_id, banned phrases) for every post in batch with a match."""
+    flagged = []
+    for post_id, texts in batch:
+        matches = _worker_moderation_filter.find("\n".join(texts))
+        if matches:
+            flagged.append((post_id, matches))
+    return flagged
+
+
+def rescan_posts(posts: list[tuple[int, list[str]]], phrases: list[str],
+                 processes: int = 4, batch_size: int = 5000) -> dict[int, list[str]]:
+    """
+    Re-check historical posts against a new phrase list on a process pool.
+
+    posts holds (post_id, [content, comment, ...]) tuples. Returns
+    post_id -> banned phrases found, for flagged posts only.
+    """
+    batches = [posts[i:i + batch_size] for i in range(0, len(posts), batch_size)]
+    if processes <= 1 or len(batches) <= 1:
+        _init_moderation_worker(phrases)
+        results = map(_scan_post_batch, batches)
+        return {post_id: found for batch in results for post_id, found in batch}
+    with multiprocessing.Pool(processes, _init_moderation_worker, (phrases,)) as pool:
+        return {post_id: found
+                for batch in pool.imap_unordered(_scan_post_batch, batches)
+                for post_id, found in batch}
+
+
+class AuthorPostIndex:
+    """
+    Each author's post IDs in creation order, for profile pages.
+
+    Per author, two append-only int arrays hold post IDs and creation
+    epochs. Post IDs ascend, so cursors are bisects; epochs ascend too
+    unless the wall clock stepped backwards, so time ranges are bisects
+    except for authors flagged as out of order, whose ranges are scanned.
+    Deleted posts become tombstones, and an author's arrays are compacted
+    once tombstones make up half of them. Live and public counts are kept as
+    running totals, so counting is O(1).
+    """
+
+    def __init__(self):
+        self._post_ids = {}               # author -> array of post IDs
+        self._created = {}                # author -> array of creation epochs
+        self._counts = {}                 # author -> [live posts, public posts]
+        self._tombstones = {}             # author -> number of deleted entries
+        self._deleted = set()
+        self._private = set()
+        self._unordered = set()           # authors whose epochs don't ascend
+
+    def add(self, post_id: int, author: str, created_at: int, is_public: bool) -> None:
+        if author not in self._post_ids:
+            self._post_ids[author], self._created[author] = array('q'), array('q')
+            self._counts[author] = [0, 0]
+            self._tombstones[author] = 0
+        created = self._created[author]
+        if created and created[-1] > created_at:
+            self._unordered.add(author)
+        self._post_ids[author].append(post_id)
+        created.append(created_at)
+        self._counts[author][0] += 1
+        if is_public:
+            self._counts[author][1] += 1
+        else:
+            self._private.add(post_id)
+
+    def set_public(self, post_id: int, author: str, is_public: bool) -> None:
+        if is_public and post_id in self._private:
+            self._private.discard(post_id)
+            self._counts[author][1] += 1
+        elif not is_public and post_id not in self._private:
+            self._private.add(post_id)
+            self._counts[author][1] -= 1
+
+    def remove(self, post_id: int, author: str) -> None:
+        if post_id in self._deleted or author not in self._post_ids:
+            return
+        self._deleted.add(post_id)
+        counts = self._counts[author]
+        counts[0] -= 1
+        if post_id in self._private:
+            self._private.discard(post_id)
+        else:
+            counts[1] -= 1
+        self._tombstones[author] += 1
+        if self._tombstones[author] * 2 >= len(self._post_ids[author]):
+            self._compact(author)
+
+    def _compact(self, author: str) -> None:
+        post_ids, created = array('q'), array('q')
+        for post_id, created_at in zip(self._post_ids[author], self._created[author]):
+            if post_id in self._deleted:
+                self._deleted.discard(post_id)
+            else:
+                post_ids.append(post_id)
+                created.append(created_at)
+        self._post_ids[author], self._created[author] = post_ids, created
+        self._tombstones[author] = 0
+        if author in self._unordered and all(map(int.__le__, created, created[1:])):
+            self._unordered.discard(author)
+
+    def count(self, author: str, include_private: bool = False) -> int:
+        counts = self._counts.get(author)
+        if counts is None:
+            return 0
+        return counts[0] if include_private else counts[1]
+
+    def _newest_first(self, author: str, end: int, start: int,
+                      include_private: bool, limit: Optional[int]) -> list[int]:
+        """Visible post IDs at positions [start, end) of author's array, newest first."""
+        post_ids, found = self._post_ids.get(author, ()), []
+        for position in range(end - 1, start - 1, -1):
+            post_id = post_ids[position]
+            if post_id in self._deleted or (not include_private and post_id in self._private):
+                continue
+            found.append(post_id)
+            if len(found) == limit:
+                break
+        return found
+
+    def in_range(self, author: str, start_time: int, end_time: int,
+                 include_private: bool = False) -> list[int]:
+        """Post IDs created in [start_time, end_time), newest first."""
+        created = self._created.get(author, ())
+        if author in self._unordered:
+            return [post_id for post_id in self._newest_first(author, len(created), 0, include_private, None)
+                    if start_time <= created[bisect.bisect_left(self._post_ids[author], post_id)] < end_time]
+        return self._newest_first(author, bisect.bisect_left(created, end_time),
+                                  bisect.bisect_left(created, start_time), include_private, None)
+
+    def page(self, author: str, cursor: Optional[int] = None, limit: int = 20,
+             include_private: bool = False) -> tuple[list[int], Optional[int]]:
+        """
+        Return up to limit post IDs older than cursor, newest first.
+
+        Pass the returned cursor to get the next page; it is None after the
+        last page. Cursors are post IDs, so they stay valid across deletes.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("Limit must be a positive integer.")
+        post_ids = self._post_ids.get(author, ())
+        end = len(post_ids) if cursor is None else bisect.bisect_left(post_ids, cursor)
+        found = self._newest_first(author, end, 0, include_private, limit + 1)
+        if len(found) > limit:
+            return found[:limit], found[limit - 1]
+        return found, None
+
+
+# =============================================================================
+# Challenge Problem helpers: University Course Management
+# =============================================================================
+
+class IndexedWaitlist:
+    """
+    FIFO waitlist with O(1) append, pop-first, membership and removal.
+
+    A deque holds (student, ticket) entries in arrival order and a dict maps
+    each waiting student to their current ticket. Removing a student from
+    the middle only deletes the dict entry; the stale deque entry is skipped
+    when it reaches the front, and the deque is rebuilt once stale entries
+    outnumber live ones, so a long-waiting front student can't pin an
+    unbounded backlog of them.
+    """
+
+    def __init__(self, students=()):
+        self._queue = deque()
+        self._tickets = {}                # student -> ticket of their live entry
+        self._next_ticket = 0
+        for student in students:
+            self.append(student)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, student: str) -> bool:
+        return student in self._tickets
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield waiting students in arrival order."""
+        for student, ticket in self._queue:
+            if self._tickets.get(student) == ticket:
+                yield student
+
+    def __repr__(self) -> str:
+        return f"IndexedWaitlist({list(self)})"
+
+    def append(self, student: str) -> None:
+        if student in self._tickets:
+            raise ValueError(f"{student} is already on the waitlist.")
+        self._tickets[student] = self._next_ticket
+        self._queue.append((student, self._next_ticket))
+        self._next_ticket += 1
+
+    def remove(self, student: str) -> None:
+        del self._tickets[student]
+        self._drop_stale_front()
+        if len(self._queue) > 2 * len(self._tickets):
+            tickets = self._tickets
+            self._queue = deque(entry for entry in self._queue if tickets.get(entry[0]) == entry[1])
+
+    def popleft(self) -> str:
+        """Remove and return the student who has waited longest."""
+        self._drop_stale_front()
+        student, _ = self._queue.popleft()
+        del self._tickets[student]
+        self._drop_stale_front()
+        return student
+
+    def _drop_stale_front(self) -> None:
+        queue, tickets = self._queue, self._tickets
+        while queue and tickets.get(queue[0][0]) != queue[0][1]:
+            queue.popleft()
+        if not tickets:
+            queue.clear()
+
+
+class PrerequisiteGraph:
+    """
+    Catalog-wide prerequisite DAG with cached transitive closures.
+
+    Every course code gets a dense index. The closure of a course - every
+    course needed before it, directly or indirectly - is cached as an int
+    bitset over those indexes, so "all courses needed before X" and
+    eligibility checks are bit operations. Adding an edge rejects cycles
+    using the cached closures and only evicts the closures of the course
+    and the courses that depend on it.
+    """
+
+    def __init__(self):
+        self._index = {}                  # course code -> dense index
+        self._codes = []                  # dense index -> course code
+        self._requires = []               # index -> set of direct prerequisite indexes
+        self._required_by = []            # index -> set of direct dependent indexes
+        self._closures = {}               # index -> bitset of all prerequisites
+
+    def __contains__(self, course_code: str) -> bool:
+        return course_code in self._index
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def index_of(self, course_code: str) -> int:
+        """Return course_code's index, registering the course if it is new."""
+        index = self._index.get(course_code)
+        if index is None:
+            index = self._index[course_code] = len(self._codes)
+            self._codes.append(course_code)
+            self._requires.append(set())
+            self._required_by.append(set())
+        return index
+
+    def add_prerequisite(self, course_code: str, prerequisite_code: str) -> bool:
+        """
+        Record that prerequisite_code must come before course_code.
+
+        Returns False if the edge already exists; raises ValueError if it
+        would create a cycle.
+        """
+        course, prerequisite = self.index_of(course_code), self.index_of(prerequisite_code)
+        if prerequisite in self._requires[course]:
+            return False
+        if course == prerequisite or self.closure(prerequisite) >> course & 1:
+            raise ValueError(f"{prerequisite_code} cannot be a prerequisite of {course_code}: "
+                             f"that would create a cycle.")
+        self._requires[course].add(prerequisite)
+        self._required_by[prerequisite].add(course)
+        # A cached closure implies cached closures for all its prerequisites,
+        # so the eviction walk can stop at any course that isn't cached.
+        stack = [course]
+        while stack:
+            index = stack.pop()
+            if self._closures.pop(index, None) is not None:
+                stack.extend(self._required_by[index])
+        return True
+
+    def closure(self, index: int) -> int:
+        """Bitset of every prerequisite (direct or indirect) of course index."""
+        cached = self._closures.get(index)
+        if cached is not None:
+            return cached
+        # Iterative post-order walk, so long prerequisite chains can't hit
+        # the recursion limit.
+        stack = [(index, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node in self._closures:
+                continue
+            if children_done:
+                bits = 0
+                for prerequisite in self._requires[node]:
+                    bits |= 1 << prerequisite | self._closures[prerequisite]
+                self._closures[node] = bits
+            else:
+                stack.append((node, True))
+                stack.extend((prerequisite, False) for prerequisite in self._requires[node]
+                             if prerequisite not in self._closures)
+        return self._closures[index]
+
+    def mask_of(self, course_codes) -> int:
+        """Bitset of the given course codes (unknown codes are ignored)."""
+        bits = 0
+        for code in course_codes:
+            index = self._index.get(code)
+            if index is not None:
+                bits |= 1 << index
+        return bits
+
+    def indexes_of(self, course_codes) -> dict[str, int]:
+        """Index of each known code in course_codes (unknown codes are left out)."""
+        return {code: self._index[code] for code in set(course_codes) if code in self._index}
+
+    def codes_in(self, bits: int) -> list[str]:
+        """Course codes whose bits are set, in index order."""
+        codes = []
+        while bits:
+            low = bits & -bits
+            codes.append(self._codes[low.bit_length() - 1])
+            bits ^= low
+        return codes
+
+    def all_prerequisites(self, course_code: str) -> list[str]:
+        """Every course needed before course_code."""
+        if course_code not in self._index:
+            return []
+        return self.codes_in(self.closure(self._index[course_code]))
+
+    def is_eligible(self, course_code: str, completed_mask: int) -> bool:
+        """True if completed_mask (see mask_of) covers every prerequisite."""
+        if course_code not in self._index:
+            return True
+        return not self.closure(self._index[course_code]) & ~completed_mask
+
+    def study_order(self, course_code: str) -> list[str]:
+        """All prerequisites of course_code then the course, in a valid order."""
+        target = self.index_of(course_code)
+        members = self.closure(target) | 1 << target
+        waiting = {}
+        ready = []
+        for index in map(self._index.get, self.codes_in(members)):
+            waiting[index] = len(self._requires[index])
+            if not waiting[index]:
+                ready.append(index)
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            index = heapq.heappop(ready)
+            order.append(self._codes[index])
+            for dependent in self._required_by[index]:
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        heapq.heappush(ready, dependent)
+        return order
+
+
+WEEK_DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def week_minute(day: str, clock: str) -> int:
+    """Convert ("Tue", "09:30") to minutes since Monday 00:00."""
+    if day not in WEEK_DAYS:
+        raise ValueError(f"Day must be one of {WEEK_DAYS}.")
+    if not isinstance(clock, str) or len(clock) != 5 or clock[2] != ':':
+        raise ValueError("Time must be in HH:MM format")
+    hours, minutes = int(clock[:2]), int(clock[3:])
+    if not (0 <= hours <= 24 and 0 <= minutes < 60) or hours * 60 + minutes > 1440:
+        raise ValueError("Time must be between 00:00 and 24:00")
+    return WEEK_DAYS.index(day) * 1440 + hours * 60 + minutes
+
+
+class ScheduleIndex:
+    """
+    Per-key weekly schedules (one per student or room) for clash detection.
+
+    A key's booked intervals never overlap - overlapping bookings are
+    rejected - so a plain sorted list per key works as an interval index:
+    a new interval can only clash with its two neighbours, found by bisect
+    in O(log n). reserve() checks and books atomically, since several
+    courses may enroll the same student at once. Keys are spread over a
+    fixed set of striped locks, so bookings for different students or rooms
+    rarely wait on each other.
+    """
+
+    def __init__(self, lock_stripes: int = 64):
+        self._starts = {}                 # key -> sorted interval starts
+        self._slots = {}                  # key -> [(start, end, course_code)] in same order
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
+
+    def _lock_for(self, key) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    def find_conflict(self, key, intervals) -> Optional[str]:
+        """Return the course code clashing with any of intervals, or None."""
+        starts, slots = self._starts.get(key), self._slots.get(key)
+        if not starts:
+            return None
+        for start, end in intervals:
+            position = bisect.bisect_left(starts, start)
+            if position < len(slots) and slots[position][0] < end:
+                return slots[position][2]
+            if position and slots[position - 1][1] > start:
+                return slots[position - 1][2]
+        return None
+
+    def reserve(self, key, intervals, course_code: str) -> Optional[str]:
+        """Book intervals for key unless one clashes; return the clashing code."""
+        with self._lock_for(key):
+            conflict = self.find_conflict(key, intervals)
+            if conflict is not None:
+                return conflict
+            starts = self._starts.setdefault(key, [])
+            slots = self._slots.setdefault(key, [])
+            for start, end in intervals:
+                position = bisect.bisect_left(starts, start)
+                starts.insert(position, start)
+                slots.insert(position, (start, end, course_code))
+            return None
+
+    def release(self, key, course_code: str) -> None:
+        """Remove every interval booked for course_code under key."""
+        with self._lock_for(key):
+            slots = self._slots.get(key)
+            if not slots:
+                return
+            kept = [slot for slot in slots if slot[2] != course_code]
+            self._slots[key] = kept
+            self._starts[key] = [slot[0] for slot in kept]
+
+
+def find_schedule_conflicts(bookings) -> list[tuple[object, str, str]]:
+    """
+    Report every pair of clashing bookings in one sweep.
+
+    bookings yields (resource, course_code, (start, end)) tuples, where a
+    resource is anything that can't be in two places at once (a room, an
+    instructor). Returns (resource, course_code, course_code) tuples. Runs in
+    O(n log n + conflicts), so a whole semester can be audited at once.
+    """
+    by_resource = {}
+    for resource, course_code, (start, end) in bookings:
+        by_resource.setdefault(resource, []).append((start, end, course_code))
+    conflicts = []
+    for resource, slots in by_resource.items():
+        slots.sort()
+        active = []                       # heap of (end, course_code) still running
+        for start, end, course_code in slots:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            conflicts.extend((resource, other, course_code) for _, other in active
+                             if other != course_code)
+            heapq.heappush(active, (end, course_code))
+    return conflicts
+
+
+class CatalogStatistics:
+    """
+    University-wide enrollment totals kept current one event at a time.
+
+    Courses call record() after every enroll/drop/promote. record() only
+    files the course's latest (groups, capacity, enrolled, waitlisted)
+    snapshot in one of several shards, each with its own lock, so busy
+    courses don't serialize behind a single statistics lock. Readers fold
+    the queued snapshots in lazily: each changed course is diffed against
+    its last merged snapshot once, however many events it had, so merging
+    costs O(log n) per changed course. Department and term totals are
+    plain counters. The fullest-course and longest-waitlist rankings are
+    lazy heaps: an update pushes a fresh entry and leaves the old one
+    behind, and queries skip entries that no longer match the course's
+    current key. The heaps are rebuilt once stale entries outnumber live
+    ones.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._snapshots = {}              # course code -> (group keys, capacity, enrolled, waitlisted)
+        self._groups = {}                 # ("department", "CS") / ("term", ("Fall", 2025)) -> totals
+        self._fill_keys = {}              # course code -> current fullest-heap key
+        self._wait_keys = {}              # course code -> current waitlist-heap key
+        self._fullest = []
+        self._longest_waitlists = []
+        self._lock = threading.Lock()     # guards the merged totals and heaps
+        self._shards = [[{}, threading.Lock()] for _ in range(shards)]  # [course code -> snapshot, lock]
+
+    def record(self, course: "Course") -> None:
+        """Queue a course's current enrollment; readers fold it into the totals."""
+        snapshot = ((("department", course.department), ("term", (course.semester, course.year))),
+                    course.max_capacity, len(course.enrolled_students), len(course.waitlist))
+        shard = self._shards[hash(course.course_code) % len(self._shards)]
+        with shard[1]:
+            shard[0][course.course_code] = snapshot
+
+    def _merge(self) -> None:
+        """Fold every queued snapshot into the totals (caller holds self._lock)."""
+        for shard in self._shards:
+            if not shard[0]:
+                continue
+            with shard[1]:
+                pending, shard[0] = shard[0], {}
+            for course_code, snapshot in pending.items():
+                self._apply(course_code, snapshot)
+
+    def _apply(self, course_code: str, snapshot: tuple) -> None:
+        groups, capacity, enrolled, waitlisted = snapshot
+        old = self._snapshots.get(course_code)
+        if old == snapshot:
+            return
+        if old is not None and old[0] != groups:
+            self._move(old, -1)           # the course was moved to another department or term
+            old = None
+        if old is None:
+            old = (groups, 0, 0, 0)
+            for group in groups:
+                self._groups.setdefault(group, [0, 0, 0, 0])[0] += 1
+        self._snapshots[course_code] = snapshot
+        self._move((groups, capacity - old[1], enrolled - old[2], waitlisted - old[3]), 1)
+        self._push(self._fullest, self._fill_keys, course_code, (-enrolled / capacity, -enrolled))
+        self._push(self._longest_waitlists, self._wait_keys, course_code,
+                   (-waitlisted,) if waitlisted else None)
+
+    def _move(self, snapshot: tuple, sign: int) -> None:
+        groups, capacity, enrolled, waitlisted = snapshot
+        for group in groups:
+            totals = self._groups[group]
+            if sign < 0:
+                totals[0] -= 1
+                if not totals[0]:
+                    del self._groups[group]
+                    continue
+            totals[1] += sign * capacity
+            totals[2] += sign * enrolled
+            totals[3] += sign * waitlisted
+
+    def _push(self, heap: list, keys: dict, course_code: str, key: Optional[tuple]) -> None:
+        if keys.get(course_code) == key:
+            return
+        if key is None:
+            keys.pop(course_code, None)
+        else:
+            keys[course_code] = key
+            heapq.heappush(heap, (*key, course_code))
+        if len(heap) > 2 * len(keys) + 64:
+            heap[:] = [(*key, code) for code, key in keys.items()]
+            heapq.heapify(heap)
+
+    def _top(self, heap: list, keys: dict, n: int) -> list[tuple]:
+        with self._lock:
+            self._merge()
+            found, seen = [], set()
+            while heap and len(found) < n:
+                entry = heapq.heappop(heap)
+                course_code = entry[-1]
+                if course_code in seen or keys.get(course_code) != entry[:-1]:
+                    continue                  # stale or duplicate entry: drop it for good
+                seen.add(course_code)
+                found.append(entry)
+            for entry in found:
+                heapq.heappush(heap, entry)
+            return found
+
+    def fullest_courses(self, n: int = 5) -> list[tuple[str, float]]:
+        """The n courses with the highest fill rate, as (course_code, fill_rate)."""
+        return [(entry[-1], -entry[0]) for entry in self._top(self._fullest, self._fill_keys, n)]
+
+    def longest_waitlists(self, n: int = 5) -> list[tuple[str, int]]:
+        """The n courses with the longest waitlists, as (course_code, length)."""
+        return [(entry[-1], -entry[0]) for entry in self._top(self._longest_waitlists, self._wait_keys, n)]
+
+    def group_totals(self, kind: str, value) -> dict[str, float]:
+        """Totals for ("department", "CS") or ("term", ("Fall", 2025))."""
+        with self._lock:
+            self._merge()
+            courses, capacity, enrolled, waitlisted = self._groups.get((kind, value), (0, 0, 0, 0))
+        return {"courses": courses, "capacity": capacity, "enrolled": enrolled,
+                "waitlisted": waitlisted, "fill_rate": enrolled / capacity if capacity else 0.0}
+
+    def dashboard(self, top_n: int = 5) -> str:
+        """Registrar's overview; cost depends on the number of groups, not courses."""
+        with self._lock:
+            self._merge()
+            groups = sorted(self._groups.items(), key=lambda item: (item[0][0], str(item[0][1])))
+        lines = ["=== Registrar Dashboard ==="]
+        for (kind, value), (courses, capacity, enrolled, waitlisted) in groups:
+            label = " ".join(map(str, value)) if kind == "term" else value
+            fill = enrolled / capacity if capacity else 0.0
+            lines.append(f"{kind.title():<10} {label:<12} {courses:>5} courses  "
+                         f"{enrolled:>7}/{capacity:<7} seats {fill:>5.0%} full  {waitlisted:>6} waitlisted")
+        lines.append("Fullest: " + (", ".join(f"{code} ({fill:.0%})" for code, fill
+                                               in self.fullest_courses(top_n)) or "none"))
+        lines.append("Longest waitlists: " + (", ".join(f"{code} ({length})" for code, length
+                                                         in self.longest_waitlists(top_n)) or "none"))
+        return "\n".join(lines)
+
+
+class _CatalogBucket:
+    """
+    Courses sharing one index value, in insertion order.
+
+    Removing a course leaves a None hole instead of shifting the list, and
+    the list is replaced (never edited) once holes outnumber courses, so a
+    query can walk it without a copy while other threads edit the catalog.
+    """
+
+    __slots__ = ("slots", "positions")
+
+    def __init__(self):
+        self.slots = []                   # courses in insertion order; None where one was removed
+        self.positions = {}               # course code -> index in slots
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def add(self, course: "Course") -> None:
+        self.positions[course.course_code] = len(self.slots)
+        self.slots.append(course)
+
+    def discard(self, course_code: str) -> None:
+        self.slots[self.positions.pop(course_code)] = None
+        if len(self.slots) > 2 * len(self.positions) + 8:
+            self.slots = [course for course in self.slots if course is not None]
+            self.positions = {course.course_code: n for n, course in enumerate(self.slots)}
+
+
+class CourseCatalog:
+    """
+    Secondary indexes over every Course, so lookups don't scan the catalog.
+
+    Each indexed field maps a value to the courses having it, plus one
+    composite (department, semester, year) index for the common "what does
+    CS offer in Fall 2025" query. Credits take only six values, so a credits
+    range is the union of at most six buckets. query() estimates every
+    usable index from bucket sizes, then walks the smallest candidate set in
+    place, checking the remaining filters on each course as the caller
+    iterates, so stopping early never costs more than was consumed.
+    """
+
+    FIELDS = ("department", "semester", "year", "instructor", "credits")
+
+    def __init__(self):
+        self._keys = {}                   # course code -> indexed field values when added
+        self._courses = _CatalogBucket()  # every indexed course, for full scans
+        self._indexes = {field: {} for field in self.FIELDS}
+        self._indexes["term"] = {}        # (department, semester, year) -> courses
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _entries(key: tuple):
+        values = dict(zip(CourseCatalog.FIELDS, key))
+        yield from values.items()
+        yield "term", (values["department"], values["semester"], values["year"])
+
+    def add(self, course: "Course") -> None:
+        """Index course under its current field values (re-indexes if present)."""
+        key = tuple(getattr(course, field) for field in self.FIELDS)
+        with self._lock:
+            old = self._keys.get(course.course_code)
+            if old == key:
+                return
+            self._keys[course.course_code] = key
+            if old is None:
+                self._courses.add(course)
+            # Only move the course between buckets whose value changed, so a
+            # query walking an unchanged bucket never meets it twice.
+            previous = dict(self._entries(old)) if old is not None else {}
+            for field, value in self._entries(key):
+                if field in previous:
+                    if previous[field] == value:
+                        continue
+                    self._discard(field, previous[field], course.course_code)
+                bucket = self._indexes[field].get(value)
+                if bucket is None:
+                    bucket = self._indexes[field][value] = _CatalogBucket()
+                bucket.add(course)
+
+    def remove(self, course: "Course") -> None:
+        """Drop course from every index."""
+        with self._lock:
+            old = self._keys.pop(course.course_code, None)
+            if old is not None:
+                for field, value in self._entries(old):
+                    self._discard(field, value, course.course_code)
+                self._courses.discard(course.course_code)
+
+    def _discard(self, field: str, value, course_code: str) -> None:
+        bucket = self._indexes[field][value]
+        bucket.discard(course_code)
+        if not bucket:
+            del self._indexes[field][value]
+
+    def _plan(self, filters: dict, min_credits: Optional[int],
+              max_credits: Optional[int]) -> tuple[str, list[_CatalogBucket]]:
+        """Pick the index with the fewest candidates: (index name, buckets to scan)."""
+        options = []
+        if all(field in filters for field in ("department", "semester", "year")):
+            term = (filters["department"], filters["semester"], filters["year"])
+            options.append(("term", [self._indexes["term"].get(term, _CatalogBucket())]))  # wins ties
+        options += [(field, [self._indexes[field].get(value, _CatalogBucket())])
+                    for field, value in filters.items()]
+        if min_credits is not None or max_credits is not None:
+            low, high = min_credits or 1, max_credits or 6
+            options.append(("credits", [bucket for credits, bucket in self._indexes["credits"].items()
+                                        if low <= credits <= high]))
+        if not options:
+            return "full scan", [self._courses]
+        return min(options, key=lambda option: sum(map(len, option[1])))
+
+    def query(self, department: Optional[str] = None, semester: Optional[str] = None,
+              year: Optional[int] = None, instructor: Optional[str] = None,
+              min_credits: Optional[int] = None, max_credits: Optional[int] = None) -> Iterator["Course"]:
+        """Lazily yield courses matching every given filter, in creation order per bucket."""
+        filters = {field: value for field, value in (("department", department), ("semester", semester),
+                                                     ("year", year), ("instructor", instructor))
+                   if value is not None}
+        with self._lock:
+            _, buckets = self._plan(filters, min_credits, max_credits)
+            slot_lists = [bucket.slots for bucket in buckets]
+        low = 1 if min_credits is None else min_credits
+        high = 6 if max_credits is None else max_credits
+        seen = set()                      # a course edited mid-query may move to a later bucket
+        for slots in slot_lists:
+            for course in slots:
+                if (course is not None and course.course_code not in seen
+                        and low <= course.credits <= high
+                        and all(getattr(course, field) == value for field, value in filters.items())
+                        and course.course_code in self._keys):
+                    seen.add(course.course_code)
+                    yield course
+
+    def explain(self, **filters) -> str:
+        """Describe which index query() would use for these filters."""
+        min_credits, max_credits = filters.pop("min_credits", None), filters.pop("max_credits", None)
+        with self._lock:
+            name, buckets = self._plan(filters, min_credits, max_credits)
+        return f"Index: {name} ({sum(map(len, buckets))} candidates of {len(self._keys)} courses)"
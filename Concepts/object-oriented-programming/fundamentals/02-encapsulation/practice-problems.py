@@ -3,19 +3,372 @@ Practical Example 1: Bank Account System
 Demonstrates encapsulation with validation, properties, and controlled access
 """
 
+import bisect
+import contextlib
+import gc
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from array import array
+from collections import deque, namedtuple
+from collections.abc import Sequence
+
+
+def _to_cents(amount):
+    """Dollar amount -> integer cents (the ledger never stores floats)."""
+    return int(round(amount * 100))
+
+
+def _format_cents(cents):
+    """Integer cents -> '250' or '12.5', the way str(amount) logged them before."""
+    if cents % 100 == 0:
+        return str(cents // 100)
+    return str(cents / 100)
+
+
+class HistoryView(Sequence):
+    """
+    Read-only, zero-copy window onto a history container.
+    
+    Properties hand this out instead of a copy: callers can take len(),
+    iterate, index and slice (only the requested slice is materialised),
+    but have no way to modify the owner's history.
+    """
+    __slots__ = ("_source",)
+    
+    def __init__(self, source):
+        self._source = source
+    
+    def __len__(self):
+        return len(self._source)
+    
+    def __iter__(self):
+        return iter(self._source)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._source[i] for i in range(*index.indices(len(self._source)))]
+        return self._source[index]
+    
+    def tail(self, n):
+        """The newest n items, oldest first."""
+        return self[max(0, len(self) - n):]
+    
+    def __eq__(self, other):
+        """Equal to a list, tuple or view holding the same items in order."""
+        if not isinstance(other, (list, tuple, HistoryView)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"HistoryView({len(self)} items)"
+
+
+class TextHistoryView(HistoryView):
+    """Read-only view that renders each ledger entry as its history line."""
+    __slots__ = ()
+    
+    def __iter__(self):
+        return map(str, self._source)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [str(entry) for entry in self._source[index]]
+        return str(self._source[index])
+
+
+class LedgerView(HistoryView):
+    """Read-only view of a TransactionLedger: all of its queries, no appends."""
+    __slots__ = ()
+    
+    @property
+    def total_recorded(self):
+        return self._source.total_recorded
+    
+    def get(self, sequence):
+        return self._source.get(sequence)
+    
+    def page(self, page_number, page_size=20):
+        return self._source.page(page_number, page_size)
+    
+    def filter(self, kinds=None, since=None, until=None, counterparty=None):
+        return self._source.filter(kinds, since, until, counterparty)
+    
+    def memory_bytes(self):
+        return self._source.memory_bytes()
+    
+    def __repr__(self):
+        return f"LedgerView({len(self)} entries)"
+
+
+class LedgerEntry(namedtuple("LedgerEntry", "sequence kind amount_cents counterparty timestamp")):
+    """One typed ledger event; str() renders it like the old text history."""
+    __slots__ = ()
+    
+    def __str__(self):
+        template = TransactionLedger.TEMPLATES[self.kind]
+        return template.format(amount=_format_cents(self.amount_cents), counterparty=self.counterparty)
+
+
+class _LedgerSegment:
+    """A fixed-size chunk of ledger columns."""
+    __slots__ = ("kinds", "amounts", "counterparties", "timestamps")
+    
+    def __init__(self):
+        self.kinds = array("B")           # index into TransactionLedger.KINDS
+        self.amounts = array("q")         # integer cents
+        self.counterparties = array("i")  # index into the ledger's counterparty table, -1 = none
+        self.timestamps = array("d")      # seconds since the epoch
+
+
+class TransactionLedger:
+    """
+    Append-only account history stored as typed columns.
+    
+    Entries live in fixed-size segments of parallel arrays (kind code,
+    amount in cents, counterparty id, timestamp): 21 bytes of column data
+    per entry, about 22 with array overhead, instead of a Python string per
+    event. Retention is checked on every append and is exact: max_entries
+    keeps exactly that many of the newest entries, and max_age_seconds
+    drops every entry older than that. Dropped entries keep their sequence
+    numbers; their storage is freed once the whole oldest segment has gone,
+    so memory can exceed the limit by at most one segment.
+    """
+    
+    SEGMENT_SIZE = 4096
+    KINDS = ("OPEN", "DEPOSIT", "WITHDRAWAL", "TRANSFER_OUT", "TRANSFER_IN",
+             "LIMIT_CHANGE", "FROZEN", "UNFROZEN", "LIMIT_RESET")
+    TEMPLATES = {
+        "OPEN": "Account created with balance: ${amount}",
+        "DEPOSIT": "Deposited: ${amount}",
+        "WITHDRAWAL": "Withdrew: ${amount}",
+        "TRANSFER_OUT": "Transferred ${amount} to account {counterparty}",
+        "TRANSFER_IN": "Received ${amount} from account {counterparty}",
+        "LIMIT_CHANGE": "Daily withdrawal limit changed to: ${amount}",
+        "FROZEN": "Account frozen",
+        "UNFROZEN": "Account unfrozen",
+        "LIMIT_RESET": "Daily withdrawal limit reset",
+    }
+    _KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+    
+    def __init__(self, max_entries=None, max_age_seconds=None):
+        """Create an empty ledger with an optional retention policy."""
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_age_seconds is not None and max_age_seconds <= 0:
+            raise ValueError("max_age_seconds must be positive")
+        self._max_entries = max_entries
+        self._max_age_seconds = max_age_seconds
+        self._segments = [_LedgerSegment()]
+        self._base_sequence = 0           # sequence number of the first slot in _segments[0]
+        self._first_sequence = 0          # sequence number of the oldest retained entry
+        self._next_sequence = 0
+        self._counterparty_ids = {}
+        self._counterparties = []
+    
+    def append(self, kind, amount_cents=0, counterparty=None, timestamp=None):
+        """Record one event; returns its sequence number."""
+        code = self._KIND_CODES.get(kind)
+        if code is None:
+            raise ValueError(f"Unknown ledger entry kind: {kind}")
+        segment = self._segments[-1]
+        if len(segment.kinds) == self.SEGMENT_SIZE:
+            segment = _LedgerSegment()
+            self._segments.append(segment)
+        if counterparty is None:
+            counterparty_id = -1
+        else:
+            counterparty_id = self._counterparty_ids.get(counterparty)
+            if counterparty_id is None:
+                counterparty_id = self._counterparty_ids[counterparty] = len(self._counterparties)
+                self._counterparties.append(counterparty)
+        segment.kinds.append(code)
+        segment.amounts.append(amount_cents)
+        segment.counterparties.append(counterparty_id)
+        segment.timestamps.append(time.time() if timestamp is None else timestamp)
+        self._next_sequence += 1
+        if self._max_entries is not None or self._max_age_seconds is not None:
+            self._apply_retention()
+        return self._next_sequence - 1
+    
+    def extend(self, kinds, amounts_cents, counterparties, timestamp=None):
+        """Record many events at once from parallel columns, with one timestamp."""
+        unknown = set(kinds) - self._KIND_CODES.keys()
+        if unknown:
+            raise ValueError(f"Unknown ledger entry kind: {unknown.pop()}")
+        for counterparty in set(counterparties):
+            if counterparty is not None and counterparty not in self._counterparty_ids:
+                self._counterparty_ids[counterparty] = len(self._counterparties)
+                self._counterparties.append(counterparty)
+        amounts = array("q", amounts_cents)
+        counterparty_ids = array("i", map(self._counterparty_ids.get, counterparties,
+                                          itertools.repeat(-1, len(counterparties))))
+        kinds = array("B", map(self._KIND_CODES.__getitem__, kinds))
+        if not len(kinds) == len(amounts) == len(counterparty_ids):
+            raise ValueError("Ledger columns must have the same length")
+        timestamp = time.time() if timestamp is None else timestamp
+        start = 0
+        while start < len(kinds):
+            segment = self._segments[-1]
+            if len(segment.kinds) == self.SEGMENT_SIZE:
+                segment = _LedgerSegment()
+                self._segments.append(segment)
+            stop = min(len(kinds), start + self.SEGMENT_SIZE - len(segment.kinds))
+            segment.kinds.extend(kinds[start:stop])
+            segment.amounts.extend(amounts[start:stop])
+            segment.counterparties.extend(counterparty_ids[start:stop])
+            segment.timestamps.extend(array("d", [timestamp]) * (stop - start))
+            self._next_sequence += stop - start
+            start = stop
+            if self._max_entries is not None or self._max_age_seconds is not None:
+                self._apply_retention()
+    
+    def _apply_retention(self):
+        """Move the oldest retained entry forward, then free segments left wholly behind it."""
+        size = self.SEGMENT_SIZE
+        if self._max_entries is not None and len(self) > self._max_entries:
+            self._first_sequence = self._next_sequence - self._max_entries
+        if self._max_age_seconds is not None and len(self):
+            cutoff = time.time() - self._max_age_seconds
+            if self._entry_timestamp(self._first_sequence) < cutoff:
+                # Timestamps only grow: skip expired segments whole, then
+                # binary-search the first live entry in the next one.
+                segment_number = (self._first_sequence - self._base_sequence) // size
+                while (segment_number < len(self._segments) - 1
+                       and self._segments[segment_number].timestamps[-1] < cutoff):
+                    segment_number += 1
+                segment_start = self._base_sequence + segment_number * size
+                timestamps = self._segments[segment_number].timestamps
+                low = max(self._first_sequence - segment_start, 0)
+                position = bisect.bisect_left(timestamps, cutoff, low)
+                self._first_sequence = segment_start + position
+        while len(self._segments) > 1 and self._first_sequence - self._base_sequence >= size:
+            del self._segments[0]
+            self._base_sequence += size
+    
+    def _entry_timestamp(self, sequence):
+        segment_number, position = divmod(sequence - self._base_sequence, self.SEGMENT_SIZE)
+        return self._segments[segment_number].timestamps[position]
+    
+    def __len__(self):
+        """Number of retained entries."""
+        return self._next_sequence - self._first_sequence
+    
+    @property
+    def total_recorded(self):
+        """Entries ever recorded, including ones dropped by retention."""
+        return self._next_sequence
+    
+    def _entry(self, sequence):
+        segment_number, position = divmod(sequence, self.SEGMENT_SIZE)
+        segment = self._segments[segment_number - self._base_sequence // self.SEGMENT_SIZE]
+        counterparty_id = segment.counterparties[position]
+        return LedgerEntry(sequence, self.KINDS[segment.kinds[position]], segment.amounts[position],
+                           self._counterparties[counterparty_id] if counterparty_id >= 0 else None,
+                           segment.timestamps[position])
+    
+    def __getitem__(self, index):
+        """Entry by position among retained entries; slices return lists."""
+        if isinstance(index, slice):
+            return [self._entry(self._first_sequence + i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ledger index out of range")
+        return self._entry(self._first_sequence + index)
+    
+    def __iter__(self):
+        """Retained entries, oldest first."""
+        for sequence in range(self._first_sequence, self._next_sequence):
+            yield self._entry(sequence)
+    
+    def get(self, sequence):
+        """Entry by sequence number, or None if never recorded or dropped by retention."""
+        if self._first_sequence <= sequence < self._next_sequence:
+            return self._entry(sequence)
+        return None
+    
+    def tail(self, n):
+        """The newest n entries, oldest first."""
+        return self[max(0, len(self) - n):]
+    
+    def page(self, page_number, page_size=20):
+        """1-based page of retained entries, oldest first."""
+        if page_number < 1 or page_size < 1:
+            raise ValueError("Page number and page size must be positive")
+        start = (page_number - 1) * page_size
+        return self[start:start + page_size]
+    
+    def filter(self, kinds=None, since=None, until=None, counterparty=None):
+        """Lazily yield entries matching every given condition; unknown kinds raise now."""
+        codes = None
+        if kinds is not None:
+            unknown = set(kinds) - self._KIND_CODES.keys()
+            if unknown:
+                raise ValueError(f"Unknown ledger entry kind: {unknown.pop()}. "
+                                 f"Valid kinds: {', '.join(self.KINDS)}")
+            codes = {self._KIND_CODES[kind] for kind in kinds}
+        counterparty_id = None
+        if counterparty is not None:
+            counterparty_id = self._counterparty_ids.get(counterparty)
+            if counterparty_id is None:
+                return iter(())
+        return self._scan(codes, since, until, counterparty_id)
+    
+    def _scan(self, codes, since, until, counterparty_id):
+        sequence = self._base_sequence
+        for segment in self._segments:
+            count = len(segment.kinds)
+            if sequence + count <= self._first_sequence:
+                sequence += count
+                continue
+            # Timestamps only grow, so whole segments can be skipped by range.
+            if count and ((since is not None and segment.timestamps[-1] < since)
+                          or (until is not None and segment.timestamps[0] > until)):
+                sequence += count
+                continue
+            for position in range(max(self._first_sequence - sequence, 0), count):
+                if ((codes is None or segment.kinds[position] in codes)
+                        and (counterparty_id is None or segment.counterparties[position] == counterparty_id)
+                        and (since is None or segment.timestamps[position] >= since)
+                        and (until is None or segment.timestamps[position] <= until)):
+                    yield self._entry(sequence + position)
+            sequence += count
+    
+    def memory_bytes(self):
+        """Approximate bytes used by the column storage."""
+        total = sys.getsizeof(self._segments)
+        for segment in self._segments:
+            for column in (segment.kinds, segment.amounts, segment.counterparties, segment.timestamps):
+                total += sys.getsizeof(column)
+        return total
+
+
+SettlementReport = namedtuple("SettlementReport", "settled rejected net_positions")
+
+
 class BankAccount:
-    def __init__(self, account_number, owner_name, initial_balance=0):
-        """Initialize a bank account with encapsulated data."""
+    _lock_ranks = itertools.count()   # global lock order used by transfer()
+    
+    def __init__(self, account_number, owner_name, initial_balance=0, max_history=10_000):
+        """Initialize a bank account; the ledger keeps the newest max_history entries (None = all)."""
         self._account_number = account_number  # Protected (read-only)
         self._owner_name = owner_name          # Protected (read-only)
         self._balance = initial_balance        # Protected (controlled access)
-        self._transaction_history = []        # Private transaction log
+        self._ledger = TransactionLedger(max_entries=max_history)  # Private transaction log
         self._is_frozen = False               # Account status
         self._daily_withdrawal_limit = 1000   # Daily limit
         self._daily_withdrawn = 0             # Track daily withdrawals
+        self._lock = threading.RLock()        # Guards balance, limits and ledger
+        self._lock_rank = next(BankAccount._lock_ranks)
         
         # Log account creation
-        self._transaction_history.append(f"Account created with balance: ${initial_balance}")
+        self._ledger.append("OPEN", _to_cents(initial_balance))
     
     # Read-only properties
     @property
@@ -40,8 +393,13 @@ class BankAccount:
     
     @property
     def transaction_history(self):
-        """Transaction history - returns copy for security."""
-        return self._transaction_history.copy()
+        """Transaction history lines, as before - read-only view, no copy."""
+        return TextHistoryView(self._ledger)
+    
+    @property
+    def ledger(self):
+        """Structured transaction ledger - read-only view (paging, filters)."""
+        return LedgerView(self._ledger)
     
     # Controlled access properties
     @property
@@ -55,59 +413,181 @@ class BankAccount:
         if amount > 10000:
             raise ValueError("Daily withdrawal limit cannot exceed $10,000")
         
-        self._daily_withdrawal_limit = amount
-        self._transaction_history.append(f"Daily withdrawal limit changed to: ${amount}")
+        with self._lock:
+            self._daily_withdrawal_limit = amount
+            self._ledger.append("LIMIT_CHANGE", _to_cents(amount))
     
     # Account operations
-    def deposit(self, amount):
-        """Deposit money into account."""
+    def _check_deposit(self, amount):
+        """Raise if a deposit of amount would be rejected (caller holds the lock)."""
         if self._is_frozen:
             raise ValueError("Cannot deposit to frozen account")
         
-        if amount < self._balance:
+        if amount <= 0:
+            raise ValueError("Deposit amount must be positive")
+    
+    def _check_withdrawal(self, amount):
+        """Raise if a withdrawal of amount would be rejected (caller holds the lock)."""
+        if self._is_frozen:
+            raise ValueError("Cannot withdraw from frozen account")
+        
+        if amount <= 0:
+            raise ValueError("Withdrawal amount must be positive")
+        
+        if amount > self._balance:
             raise ValueError("Insufficient funds")
         
         if self._daily_withdrawn + amount > self._daily_withdrawal_limit:
             raise ValueError(f"Daily withdrawal limit exceeded. Limit: ${self._daily_withdrawal_limit}")
-        
-        self._balance -= amount
-        self._daily_withdrawn += amount
-        self._transaction_history.append(f"Withdrew: ${amount}")
-        print(f"Successfully withdrew ${amount}. New balance: ${self._balance}")
+    
+    def deposit(self, amount):
+        """Deposit money into account."""
+        with self._lock:
+            self._check_deposit(amount)
+            self._balance += amount
+            self._ledger.append("DEPOSIT", _to_cents(amount))
+            new_balance = self._balance
+        print(f"Successfully deposited ${amount}. New balance: ${new_balance}")
+    
+    def withdraw(self, amount):
+        """Withdraw money from account."""
+        with self._lock:
+            self._check_withdrawal(amount)
+            self._balance -= amount
+            self._daily_withdrawn += amount
+            self._ledger.append("WITHDRAWAL", _to_cents(amount))
+            new_balance = self._balance
+        print(f"Successfully withdrew ${amount}. New balance: ${new_balance}")
     
     def transfer(self, amount, target_account):
-        """Transfer money to another account."""
+        """Transfer money to another account - both legs or neither."""
         if not isinstance(target_account, BankAccount):
             raise TypeError("Target must be a BankAccount instance")
         
-        # Withdraw from this account
-        self.withdraw(amount)
-        
-        # Deposit to target account
-        target_account.deposit(amount)
+        if target_account is self:
+            raise ValueError("Cannot transfer to the same account")
         
-        # Update transaction history
-        self._transaction_history.append(f"Transferred ${amount} to account {target_account.account_number}")
-        target_account._transaction_history.append(f"Received ${amount} from account {self.account_number}")
+        # Always lock the lower-ranked account first. If A->B took A then B
+        # while B->A took B then A, each could hold one lock and wait forever.
+        first, second = sorted((self, target_account), key=lambda account: account._lock_rank)
+        with first._lock, second._lock:
+            # Validate both legs before changing either, so nothing can fail
+            # half way and lose the money.
+            self._check_withdrawal(amount)
+            target_account._check_deposit(amount)
+            
+            self._balance -= amount
+            self._daily_withdrawn += amount
+            target_account._balance += amount
+            self._ledger.append("TRANSFER_OUT", _to_cents(amount), target_account.account_number)
+            target_account._ledger.append("TRANSFER_IN", _to_cents(amount), self.account_number)
         
         print(f"Successfully transferred ${amount} to account {target_account.account_number}")
     
+    @staticmethod
+    def settle_batch(transfers):
+        """
+        Settle a list of (source, target, amount) transfers in one go.
+        
+        The final balances, daily totals and ledgers are the same as calling
+        source.transfer(amount, target) for each transfer in order and
+        skipping the ones that raise ValueError. One pass over the batch
+        decides which transfers succeed, using plain dicts instead of
+        per-transfer locking, ledger calls and printing. Each account then
+        gets a single balance update and one bulk ledger write. All accounts
+        involved are locked (in rank order) for the whole batch.
+        
+        Most of the remaining time goes to the two ledger legs each transfer
+        must record, so this is a few times faster than transfer(), not
+        orders of magnitude. Netting each account's transfers up front and
+        replaying only those that could hit a limit gives the same result,
+        but its extra passes over the batch cost more than the checks they
+        save in pure Python.
+        
+        Returns SettlementReport(settled, rejected, net_positions) with
+        rejected as [(index, reason)] and net_positions by account number.
+        """
+        transfers = list(transfers)
+        accounts = {}
+        for source, target, _ in transfers:
+            if not isinstance(source, BankAccount) or not isinstance(target, BankAccount):
+                raise TypeError("Target must be a BankAccount instance")
+            accounts[source] = accounts[target] = None
+        
+        with contextlib.ExitStack() as locks:
+            for account in sorted(accounts, key=lambda account: account._lock_rank):
+                locks.enter_context(account._lock)
+            
+            balance = {account: account._balance for account in accounts}
+            withdrawn = {account: account._daily_withdrawn for account in accounts}
+            frozen = {account for account in accounts if account._is_frozen}
+            legs = {account: ([], []) for account in accounts}   # signed cents, counterparty
+            rejected = []
+            cents_of = {}                  # amount -> cents; settlement amounts repeat a lot
+            # Same checks, in the same order, as transfer() - so the same
+            # transfers are rejected with the same reasons.
+            for index, (source, target, amount) in enumerate(transfers):
+                if source is target:
+                    reason = "Cannot transfer to the same account"
+                elif source in frozen:
+                    reason = "Cannot withdraw from frozen account"
+                elif amount <= 0:
+                    reason = "Withdrawal amount must be positive"
+                elif amount > balance[source]:
+                    reason = "Insufficient funds"
+                elif withdrawn[source] + amount > source._daily_withdrawal_limit:
+                    reason = f"Daily withdrawal limit exceeded. Limit: ${source._daily_withdrawal_limit}"
+                elif target in frozen:
+                    reason = "Cannot deposit to frozen account"
+                else:
+                    balance[source] -= amount
+                    withdrawn[source] += amount
+                    balance[target] += amount
+                    cents = cents_of.get(amount)
+                    if cents is None:
+                        cents = cents_of[amount] = _to_cents(amount)
+                    source_legs, target_legs = legs[source], legs[target]
+                    source_legs[0].append(-cents)
+                    source_legs[1].append(target._account_number)
+                    target_legs[0].append(cents)
+                    target_legs[1].append(source._account_number)
+                    continue
+                rejected.append((index, reason))
+            
+            net_positions = {}
+            for account in accounts:
+                signed_cents, counterparties = legs[account]
+                if signed_cents:
+                    net_positions[account._account_number] = balance[account] - account._balance
+                    account._balance = balance[account]
+                    account._daily_withdrawn = withdrawn[account]
+                    kinds = ["TRANSFER_OUT" if cents < 0 else "TRANSFER_IN" for cents in signed_cents]
+                    account._ledger.extend(kinds, map(abs, signed_cents), counterparties)
+        
+        settled = len(transfers) - len(rejected)
+        print(f"Settled {settled} transfers across {len(net_positions)} accounts "
+              f"({len(rejected)} rejected)")
+        return SettlementReport(settled, rejected, net_positions)
+    
     def freeze_account(self):
         """Freeze the account (admin function)."""
-        self._is_frozen = True
-        self._transaction_history.append("Account frozen")
+        with self._lock:
+            self._is_frozen = True
+            self._ledger.append("FROZEN")
         print("Account has been frozen")
     
     def unfreeze_account(self):
         """Unfreeze the account (admin function)."""
-        self._is_frozen = False
-        self._transaction_history.append("Account unfrozen")
+        with self._lock:
+            self._is_frozen = False
+            self._ledger.append("UNFROZEN")
         print("Account has been unfrozen")
     
     def reset_daily_withdrawal(self):
         """Reset daily withdrawal counter (called daily by system)."""
-        self._daily_withdrawn = 0
-        self._transaction_history.append("Daily withdrawal limit reset")
+        with self._lock:
+            self._daily_withdrawn = 0
+            self._ledger.append("LIMIT_RESET")
     
     def get_account_summary(self):
         """Get complete account information."""
@@ -123,7 +603,7 @@ class BankAccount:
     def print_transaction_history(self, last_n=5):
         """Print recent transaction history."""
         print(f"\n=== Last {last_n} Transactions ===")
-        recent_transactions = self.transaction_history[-last_n:]
+        recent_transactions = self.transaction_history.tail(last_n)
         for i, transaction in enumerate(recent_transactions, 1):
             print(f"{i}. {transaction}")
 
@@ -146,7 +626,7 @@ class SmartThermostat:
         self._is_cooling = False
         self._is_online = True
         self._energy_usage = 0.0          # kWh used today
-        self._temperature_history = []    # Recent temperature readings
+        self._temperature_history = deque(maxlen=24)  # Last 24 temperature readings
         self._schedule = {}               # Heating/cooling schedule
         self._max_temp = 85.0
         self._min_temp = 45.0
@@ -186,8 +666,8 @@ class SmartThermostat:
     
     @property
     def temperature_history(self):
-        """Temperature history - returns copy for security."""
-        return self._temperature_history.copy()
+        """Last 24 readings - read-only snapshot; later readings don't shift it."""
+        return HistoryView(tuple(self._temperature_history))
     
     # Controlled access properties
     @property
@@ -255,7 +735,7 @@ class SmartThermostat:
         
         # Simple efficiency calculation (higher is better)
         avg_diff = sum(abs(reading - self._target_temperature) 
-                      for reading in self._temperature_history[-24:]) / max(1, len(self._temperature_history[-24:]))
+                      for reading in self._temperature_history) / max(1, len(self._temperature_history))
         
         efficiency = max(0, 100 - (avg_diff * 10) - (self._energy_usage * 2))
         return round(efficiency, 1)
@@ -310,11 +790,7 @@ class SmartThermostat:
             raise TypeError("Temperature must be a number")
         
         self._current_temperature = float(new_temp)
-        self._temperature_history.append(new_temp)
-        
-        # Keep only last 24 readings
-        if len(self._temperature_history) > 24:
-            self._temperature_history.pop(0)
+        self._temperature_history.append(new_temp)  # deque drops the oldest past 24
         
         print(f"📊 Temperature reading: {new_temp}°F")
         
@@ -441,6 +917,8 @@ def run_smart_thermostat_demo():
     print(f"Target temperature in Celsius: {thermostat.target_celsius:.1f}°C")
     print(f"Temperature difference: {thermostat.temperature_difference:.1f}°F")
     print(f"Efficiency rating: {thermostat.efficiency_rating}%")
+    history = thermostat.temperature_history
+    print(f"Last 3 of {len(history)} readings: {history.tail(3)}")
     
     # Test read-only properties
     print(f"Device ID: {thermostat.device_id}")
@@ -517,12 +995,30 @@ def run_bank_account_demo():
     # Test transfer
     alice_account.transfer(300, bob_account)
     
+    print("\n=== Testing Batch Settlement ===")
+    
+    # Alice pays Bob, Bob pays Alice back: netting gives one update each
+    report = BankAccount.settle_batch([
+        (alice_account, bob_account, 50),
+        (bob_account, alice_account, 20),
+        (bob_account, bob_account, 5),       # rejected, as transfer() would
+    ])
+    print(f"Net positions: {report.net_positions} | Rejected: {report.rejected}")
+    
     print("\n=== Testing Property Access ===")
     
     # Test read-only properties
     print(f"Alice's balance: ${alice_account.balance}")
     print(f"Bob's account number: {bob_account.account_number}")
     
+    # History is a read-only view, not a copy
+    history = alice_account.transaction_history
+    print(f"Alice has {len(history)} transactions; latest: {history[-1]}")
+    try:
+        history[0] = "Deposited: $1000000"
+    except TypeError as e:
+        print(f"Error: {e}")
+    
     # Test property setter
     alice_account.daily_withdrawal_limit = 2000
     
@@ -562,6 +1058,7 @@ def run_bank_account_demo():
         (lambda: alice_account.deposit(0), "Zero deposit"),
         (lambda: alice_account.withdraw(10000), "Insufficient funds"),
         (lambda: alice_account.transfer(100, "invalid"), "Invalid transfer target"),
+        (lambda: alice_account.transfer(100, alice_account), "Transfer to same account"),
     ]
     
     for test_func, description in test_cases:
@@ -570,6 +1067,164 @@ def run_bank_account_demo():
         except (ValueError, TypeError) as e:
             print(f"{description}: {e}")
 
+def benchmark_transaction_ledger(num_events=1_000_000):
+    """Compare the structured ledger with the old list of f-strings."""
+    print(f"=== Transaction Ledger Benchmark: {num_events:,} events ===")
+    rng = random.Random(42)
+    kinds = ["DEPOSIT", "WITHDRAWAL", "TRANSFER_OUT", "TRANSFER_IN", "LIMIT_RESET"]
+    events = [(rng.choice(kinds), rng.randrange(1, 100_000), f"ACC{rng.randrange(1000):03d}")
+              for _ in range(num_events)]
+    
+    start = time.perf_counter()
+    ledger = TransactionLedger()
+    for kind, cents, counterparty in events:
+        ledger.append(kind, cents, counterparty if kind.startswith("TRANSFER") else None)
+    ledger_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    strings = []
+    for entry in ledger:
+        strings.append(str(entry))
+    string_time = time.perf_counter() - start
+    string_bytes = sys.getsizeof(strings) + sum(sys.getsizeof(text) for text in strings)
+    
+    start = time.perf_counter()
+    transfers_in = sum(1 for _ in ledger.filter(kinds=["TRANSFER_IN"], counterparty="ACC007"))
+    page = ledger.page(2_000, page_size=50)
+    query_time = time.perf_counter() - start
+    
+    print(f"Ledger: {ledger.memory_bytes() / 1e6:.1f} MB, appended in {ledger_time:.2f}s")
+    print(f"String history: {string_bytes / 1e6:.1f} MB "
+          f"({string_bytes / ledger.memory_bytes():.1f}x larger), rendered in {string_time:.2f}s")
+    print(f"Filter + page: {query_time * 1e3:.0f}ms ({transfers_in} transfers from ACC007, "
+          f"page starts at #{page[0].sequence})")
+    
+    capped = TransactionLedger(max_entries=10_000)
+    for kind, cents, counterparty in events[:100_000]:
+        capped.append(kind, cents)
+    print(f"Retention (max_entries=10,000): keeps {len(capped):,} of {capped.total_recorded:,} entries, "
+          f"{capped.memory_bytes() / 1e3:.0f} KB")
+
+def benchmark_history_views(num_entries=1_000_000, accesses=100):
+    """Time summary-style history access: copying vs read-only views."""
+    print(f"=== History View Benchmark: {num_entries:,} entries, {accesses} accesses ===")
+    ledger = TransactionLedger()
+    for n in range(num_entries):
+        ledger.append("DEPOSIT", n)
+    old_history = [f"Deposited: ${n}" for n in range(num_entries)]
+    gc.collect()    # keep the setup's garbage out of the timings
+    
+    # What transaction_history used to cost: a full list copy per access
+    start = time.perf_counter()
+    for _ in range(accesses):
+        history = old_history.copy()
+        len(history), history[-5:]
+    copy_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(accesses):
+        view = TextHistoryView(ledger)
+        len(view), view.tail(5)
+    view_time = time.perf_counter() - start
+    
+    print(f"Copy per access: {copy_time:.2f}s | View: {view_time * 1e3:.2f}ms | "
+          f"Speed-up: {copy_time / view_time:,.0f}x")
+
+def stress_test_transfers(num_accounts=200, num_transfers=100_000, num_threads=64):
+    """Random concurrent transfers; checks money is conserved and nothing deadlocks."""
+    print(f"=== Transfer Stress Test: {num_transfers:,} transfers, {num_threads} threads, "
+          f"{num_accounts} accounts ===")
+    accounts = [BankAccount(f"STRESS{n:04d}", f"Customer {n}", 10_000, max_history=None)
+                for n in range(num_accounts)]   # full ledgers, so they can be checked against balances
+    for account in accounts:
+        account.daily_withdrawal_limit = 10_000
+    total_before = sum(account.balance for account in accounts)
+    completed, rejected = [0] * num_threads, [0] * num_threads
+    
+    def worker(thread_number):
+        rng = random.Random(thread_number)
+        for _ in range(thread_number, num_transfers, num_threads):
+            source, target = rng.sample(accounts, 2)
+            try:
+                source.transfer(rng.randint(1, 50), target)
+                completed[thread_number] += 1
+            except ValueError:
+                rejected[thread_number] += 1   # insufficient funds / daily limit
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(num_threads)]
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=120)
+    elapsed = time.perf_counter() - start
+    
+    stuck = sum(thread.is_alive() for thread in threads)
+    total_after = sum(account.balance for account in accounts)
+    # Every account's ledger must also explain its balance exactly
+    signs = {"OPEN": 1, "DEPOSIT": 1, "TRANSFER_IN": 1, "WITHDRAWAL": -1, "TRANSFER_OUT": -1}
+    ledgers_match = all(
+        sum(signs.get(entry.kind, 0) * entry.amount_cents for entry in account.ledger)
+        == _to_cents(account.balance) for account in accounts)
+    print(f"Completed: {sum(completed):,} | Rejected: {sum(rejected):,} | {elapsed:.2f}s "
+          f"({sum(completed) / elapsed:,.0f} transfers/s)")
+    print(f"Total before: ${total_before:,} | after: ${total_after:,} | "
+          f"Conserved: {total_before == total_after} | Ledgers match: {ledgers_match} | "
+          f"Deadlocked threads: {stuck}")
+
+def benchmark_batch_settlement(num_accounts=1_000, num_transfers=200_000):
+    """Compare batch settlement with replaying transfer() one call at a time."""
+    print(f"=== Batch Settlement Benchmark: {num_transfers:,} transfers, {num_accounts:,} accounts ===")
+    
+    def open_accounts():
+        accounts = [BankAccount(f"SETTLE{n:05d}", f"Customer {n}", 5_000) for n in range(num_accounts)]
+        for account in accounts:
+            account.daily_withdrawal_limit = 10_000
+        for account in accounts[::50]:
+            account._is_frozen = True      # a few frozen accounts, as in real books
+        return accounts
+    
+    rng = random.Random(7)
+    plan = [(rng.randrange(num_accounts), rng.randrange(num_accounts), rng.randint(1, 20))
+            for _ in range(num_transfers)]
+    replayed, batched = open_accounts(), open_accounts()
+    batch = [(batched[source], batched[target], amount) for source, target, amount in plan]
+    
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        gc.collect()
+        start = time.perf_counter()
+        for source, target, amount in plan:
+            try:
+                replayed[source].transfer(amount, replayed[target])
+            except ValueError:
+                pass
+        replay_time = time.perf_counter() - start
+        
+        gc.collect()
+        start = time.perf_counter()
+        report = BankAccount.settle_batch(batch)
+        batch_time = time.perf_counter() - start
+    
+    # The floor for any batch path: writing the same ledger legs and nothing else
+    legs = [(list(account.ledger.filter(kinds=["TRANSFER_OUT", "TRANSFER_IN"])), TransactionLedger())
+            for account in batched]
+    gc.collect()
+    start = time.perf_counter()
+    for entries, ledger in legs:
+        ledger.extend([entry.kind for entry in entries], [entry.amount_cents for entry in entries],
+                      [entry.counterparty for entry in entries])
+    ledger_time = time.perf_counter() - start
+    
+    identical = all(
+        a.balance == b.balance and a._daily_withdrawn == b._daily_withdrawn
+        and [entry[1:4] for entry in a.ledger] == [entry[1:4] for entry in b.ledger]
+        for a, b in zip(replayed, batched))
+    print(f"Settled: {report.settled:,} | Rejected: {len(report.rejected):,}")
+    print(f"transfer() replay: {replay_time:.2f}s | Batch: {batch_time:.2f}s | "
+          f"Speed-up: {replay_time / batch_time:.0f}x | Identical final state: {identical}")
+    print(f"Ledger legs alone: {ledger_time:.2f}s ({ledger_time / batch_time:.0%} of the batch)")
+
 # Example usage and testing
 if __name__ == "__main__":
 
@@ -577,4 +1232,16 @@ if __name__ == "__main__":
     run_bank_account_demo()
     
     # print("\n=== Running Smart Thermostat Demo ===")
-    # run_smart_thermostat_demo()
\ No newline at end of file
+    # run_smart_thermostat_demo()
+    
+    # print("\n=== Running Transaction Ledger Benchmark ===")
+    # benchmark_transaction_ledger()
+    
+    # print("\n=== Running History View Benchmark ===")
+    # benchmark_history_views()
+    
+    # print("\n=== Running Transfer Stress Test ===")
+    # stress_test_transfers()
+    
+    # print("\n=== Running Batch Settlement Benchmark ===")
+    # benchmark_batch_settlement()
\ No newline at end of file